@@ -0,0 +1,67 @@
+from ctypes import memmove
+from queue import Empty, Queue
+
+import pytest
+from wyzecam.tutk import tutk, tutk_protocol
+from wyzecam.tutk.tutk_ioctl_mux import TutkIOCtrlMux
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Replace the SDK ioctl calls; put encoded messages on the queue to 'receive' them."""
+    queue = Queue()
+
+    def av_recv_io_ctrl_into(lib, av_chan_id, ctl_buffer, buffer_len, timeout_ms):
+        try:
+            msg = queue.get(timeout=0.01)
+        except Empty:
+            return tutk.AV_ER_TIMEOUT, 0
+        memmove(ctl_buffer, msg, len(msg))
+        return len(msg), tutk.IOTYPE_USER_DEFINED_START
+
+    monkeypatch.setattr(tutk, "av_send_io_ctrl", lambda *args: 0)
+    monkeypatch.setattr(tutk, "av_recv_io_ctrl_into", av_recv_io_ctrl_into)
+    return queue
+
+
+@pytest.fixture
+def mux(responses):
+    with TutkIOCtrlMux(None, 0) as mux:
+        yield mux
+
+
+def camera_info_response(value: int) -> bytes:
+    return tutk_protocol.encode(10021, b'{"value": %d}' % value)
+
+
+def test_retry_after_result_timeout(mux, responses):
+    first = mux.send_ioctl(tutk_protocol.K10020CheckCameraInfo())
+    with pytest.raises(Empty):
+        first.result(timeout=0.05)
+
+    retry = mux.send_ioctl(tutk_protocol.K10020CheckCameraInfo())
+    responses.put(camera_info_response(1))
+
+    assert retry.result(timeout=2) == {"value": 1}
+    assert not mux.pending[10021]
+
+
+def test_retry_after_waitfor_timeout(mux, responses):
+    first = mux.send_ioctl(tutk_protocol.K10020CheckCameraInfo())
+    assert mux.waitfor(first, timeout=0.05) is None
+
+    retry = mux.send_ioctl(tutk_protocol.K10020CheckCameraInfo())
+    responses.put(camera_info_response(2))
+
+    assert mux.waitfor(retry, timeout=2) == {"value": 2}
+
+
+def test_non_blocking_result_does_not_claim_later_response(mux, responses):
+    first = mux.send_ioctl(tutk_protocol.K10020CheckCameraInfo())
+    with pytest.raises(Empty):
+        first.result(block=False)
+
+    retry = mux.send_ioctl(tutk_protocol.K10020CheckCameraInfo())
+    responses.put(camera_info_response(3))
+
+    assert retry.result(timeout=2) == {"value": 3}
@@ -125,8 +125,7 @@ def boa_control(sess: WyzeIOTCSession, boa_cam: Optional[dict]):
         iotctrl_msg.append(tutk_protocol.K10148StartBoa())
     if iotctrl_msg:
         with sess.iotctrl_mux() as mux:
-            for msg in iotctrl_msg:
-                mux.send_ioctl(msg)
+            mux.send_ioctl_batch(iotctrl_msg)
     if datetime.now() > boa_cam["cooldown"] and (
         env_bool("boa_alarm") or env_bool("boa_motion")
     ):
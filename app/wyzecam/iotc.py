@@ -250,7 +250,7 @@ class WyzeIOTCSession:
         bitrate: int = tutk.BITRATE_HD,
         enable_audio: bool = True,
         connect_timeout: int = 20,
-        stream_state: c_int = c_int(0),
+        stream_state: Optional[c_int] = None,
         substream: bool = False,
     ) -> None:
         """Construct a wyze iotc session.
@@ -269,8 +269,8 @@ class WyzeIOTCSession:
         self.tutk_platform_lib: CDLL = tutk_platform_lib
         self.account: WyzeAccount = account
         self.camera: WyzeCamera = camera
-        self.session_id: Optional[c_int] = None
-        self.av_chan_id: Optional[c_int] = None
+        self.session_id: Optional[int] = None
+        self.av_chan_id: Optional[int] = None
         self.state: WyzeIOTCSessionState = WyzeIOTCSessionState.DISCONNECTED
 
         self.preferred_frame_rate: int = 15
@@ -278,7 +278,7 @@ class WyzeIOTCSession:
         self.preferred_bitrate: int = bitrate
         self.connect_timeout: int = connect_timeout
         self.enable_audio: bool = enable_audio
-        self.stream_state: c_int = stream_state
+        self.stream_state: c_int = c_int(0) if stream_state is None else stream_state
         self.audio_pipe_ready: bool = False
         self.frame_ts: float = 0.0
         self.substream: bool = substream
@@ -397,24 +397,29 @@ class WyzeIOTCSession:
         if len(decoded_url := resp.decode().split("rtsp://")) > 1:
             return f"rtsp://{decoded_url[1]}"
 
-    def recv_bridge_data(self) -> Iterator[bytes]:
+    def recv_bridge_data(self) -> Iterator[memoryview]:
         """A generator for returning raw video frames for the bridge.
 
         Note that the format of this data is either raw h264 or HVEC H265 video. You will
         have to introspect the frame_info object to determine the format!
+
+        Each frame is a view into the receive buffer and is only valid until the
+        next frame is requested; write it out (or copy it) before then.
         """
         assert self.av_chan_id is not None, "Please call _connect() first!"
         self.sync_camera_time()
 
+        # bind once; the SDK call itself releases the GIL (see tutk.load_library)
+        recv_frame_data = tutk.av_recv_frame_view
+        lib, av_chan_id = self.tutk_platform_lib, self.av_chan_id
+
         have_key_frame = False
         while self.should_stream(sleep=self.sleep_interval):
             if not self._received_first_frame(have_key_frame):
                 have_key_frame = True
                 continue
 
-            err_no, frame_data, frame_info, _ = tutk.av_recv_frame_data(
-                self.tutk_platform_lib, self.av_chan_id
-            )
+            err_no, frame_data, frame_info, _ = recv_frame_data(lib, av_chan_id)
 
             if not frame_data or err_no < 0:
                 self._handle_frame_error(err_no)
@@ -690,7 +695,7 @@ class WyzeIOTCSession:
             assert self.camera.p2p_id, "Missing p2p_id"
 
             session_id = tutk.iotc_get_session_id(self.tutk_platform_lib)
-            if session_id < 0:  # type: ignore
+            if session_id < 0:
                 raise tutk.TutkError(session_id)
             self.session_id = session_id
 
@@ -712,7 +717,7 @@ class WyzeIOTCSession:
                     self.connect_timeout,
                 )
 
-            if session_id < 0:  # type: ignore
+            if session_id < 0:
                 raise tutk.TutkError(session_id)
             self.session_id = session_id
 
@@ -733,7 +738,7 @@ class WyzeIOTCSession:
                 resend,
             )
 
-            if av_chan_id < 0:  # type: ignore
+            if av_chan_id < 0:
                 raise tutk.TutkError(av_chan_id)
             self.av_chan_id = av_chan_id
             self.state = WyzeIOTCSessionState.CONNECTED
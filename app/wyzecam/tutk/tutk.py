@@ -1,6 +1,9 @@
+import os
 import pathlib
+import threading
 from ctypes import (
     CDLL,
+    Array,
     POINTER,
     Structure,
     byref,
@@ -13,11 +16,15 @@ from ctypes import (
     c_uint8,
     c_uint16,
     c_uint32,
-    cast,
-    cdll,
     create_string_buffer,
+    memmove,
+    memset,
     sizeof,
 )
+from enum import IntEnum
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
 from typing import Optional, Union
 
 BITRATE_360P = 0x1E
@@ -106,195 +113,218 @@ AV_ER_LOSED_THIS_FRAME = -20014
 An error sent during video streaming if the frame was lost in transmission.
 """
 
+LOG_PATH_ENABLED = False
+"""
+Opt-in for the deprecated `iotc_set_log_path`; use `iotc_set_log_attr` instead.
+"""
+
 project_root = pathlib.Path(__file__).parent
 
+_local = threading.local()
+"""Per-thread scratch structs and buffers reused across SDK calls."""
+
+
+def _as_bytes(value: Union[str, bytes]) -> bytes:
+    """Return value as ascii bytes, passing pre-encoded bytes through untouched."""
+    return value if isinstance(value, bytes) else value.encode("ascii")
+
+
+@lru_cache(maxsize=64)
+def _encode_uid(p2p_id: Union[str, bytes]) -> bytes:
+    """Encode a device UID once; the UID never changes for a given camera."""
+    return _as_bytes(p2p_id)
+
+
+class TutkErrorCode(IntEnum):
+    """Error codes returned by the IOTC, AV and tunnel SDK calls."""
+
+    IOTC_ER_SERVER_NOT_RESPONSE = -1
+    IOTC_ER_FAIL_RESOLVE_HOSTNAME = -2
+    IOTC_ER_ALREADY_INITIALIZED = -3
+    IOTC_ER_FAIL_CREATE_MUTEX = -4
+    IOTC_ER_FAIL_CREATE_THREAD = -5
+    IOTC_ER_FAIL_CREATE_SOCKET = -6
+    IOTC_ER_FAIL_SOCKET_OPT = -7
+    IOTC_ER_FAIL_SOCKET_BIND = -8
+    IOTC_ER_UNLICENSE = -10
+    IOTC_ER_LOGIN_ALREADY_CALLED = -11
+    IOTC_ER_NOT_INITIALIZED = -12
+    IOTC_ER_TIMEOUT = -13
+    IOTC_ER_INVALID_SID = -14
+    IOTC_ER_UNKNOWN_DEVICE = -15
+    IOTC_ER_FAIL_GET_LOCAL_IP = -16
+    IOTC_ER_LISTEN_ALREADY_CALLED = -17
+    IOTC_ER_EXCEED_MAX_SESSION = -18
+    IOTC_ER_CAN_NOT_FIND_DEVICE = -19
+    IOTC_ER_CONNECT_IS_CALLING = -20
+    IOTC_ER_SESSION_CLOSE_BY_REMOTE = -22
+    IOTC_ER_REMOTE_TIMEOUT_DISCONNECT = -23
+    IOTC_ER_DEVICE_NOT_LISTENING = -24
+    IOTC_ER_CH_NOT_ON = -26
+    IOTC_ER_FAIL_CONNECT_SEARCH = -27
+    IOTC_ER_MASTER_TOO_FEW = -28
+    IOTC_ER_AES_CERTIFY_FAIL = -29
+    IOTC_ER_SESSION_NO_FREE_CHANNEL = -31
+    IOTC_ER_TCP_TRAVEL_FAILED = -32
+    IOTC_ER_TCP_CONNECT_TO_SERVER_FAILED = -33
+    IOTC_ER_CLIENT_NOT_SECURE_MODE = -34
+    IOTC_ER_CLIENT_SECURE_MODE = -35
+    IOTC_ER_DEVICE_NOT_SECURE_MODE = -36
+    IOTC_ER_DEVICE_SECURE_MODE = -37
+    IOTC_ER_INVALID_MODE = -38
+    IOTC_ER_EXIT_LISTEN = -39
+    IOTC_ER_NO_PERMISSION = -40
+    IOTC_ER_NETWORK_UNREACHABLE = -41
+    IOTC_ER_FAIL_SETUP_RELAY = -42
+    IOTC_ER_NOT_SUPPORT_RELAY = -43
+    IOTC_ER_NO_SERVER_LIST = -44
+    IOTC_ER_DEVICE_MULTI_LOGIN = -45
+    IOTC_ER_INVALID_ARG = -46
+    IOTC_ER_NOT_SUPPORT_PE = -47
+    IOTC_ER_DEVICE_EXCEED_MAX_SESSION = -48
+    IOTC_ER_BLOCKED_CALL = -49
+    IOTC_ER_SESSION_CLOSED = -50
+    IOTC_ER_REMOTE_NOT_SUPPORTED = -51
+    IOTC_ER_ABORTED = -52
+    IOTC_ER_EXCEED_MAX_PACKET_SIZE = -53
+    IOTC_ER_SERVER_NOT_SUPPORT = -54
+    IOTC_ER_NO_PATH_TO_WRITE_DATA = -55
+    IOTC_ER_SERVICE_IS_NOT_STARTED = -56
+    IOTC_ER_STILL_IN_PROCESSING = -57
+    IOTC_ER_NOT_ENOUGH_MEMORY = -58
+    IOTC_ER_DEVICE_IS_BANNED = -59
+    IOTC_ER_MASTER_NOT_RESPONSE = -60
+    IOTC_ER_RESOURCE_ERROR = -61
+    IOTC_ER_QUEUE_FULL = -62
+    IOTC_ER_NOT_SUPPORT = -63
+    IOTC_ER_DEVICE_IS_SLEEP = -64
+    IOTC_ER_TCP_NOT_SUPPORT = -65
+    IOTC_ER_WAKEUP_NOT_INITIALIZED = -66
+    IOTC_ER_DEVICE_REJECT_BYPORT = -67
+    IOTC_ER_DEVICE_REJECT_BY_WRONG_AUTH_KEY = -68
+    IOTC_ER_DEVICE_NOT_USE_KEY_AUTHENTICATION = -69
+    IOTC_ER_DID_NOT_LOGIN = -70
+    IOTC_ER_DID_NOT_LOGIN_WITH_AUTHKEY = -71
+    IOTC_ER_SESSION_IN_USE = -72
+    IOTC_ER_DEVICE_OFFLINE = -90
+    IOTC_ER_MASTER_INVALID = -91
+    TUTK_ER_ALREADY_INITIALIZED = -1001
+    TUTK_ER_INVALID_ARG = -1002
+    TUTK_ER_MEM_INSUFFICIENT = -1003
+    TUTK_ER_INVALID_LICENSE_KEY = -1004
+    TUTK_ER_NO_LICENSE_KEY = -1005
+    RDT_ER_NOT_INITIALIZED = -10000
+    RDT_ER_ALREADY_INITIALIZED = -10001
+    RDT_ER_EXCEED_MAX_CHANNEL = -10002
+    RDT_ER_MEM_INSUFF = -10003
+    RDT_ER_FAIL_CREATE_THREAD = -10004
+    RDT_ER_FAIL_CREATE_MUTEX = -10005
+    RDT_ER_RDT_DESTROYED = -10006
+    RDT_ER_TIMEOUT = -10007
+    RDT_ER_INVALID_RDT_ID = -10008
+    RDT_ER_RCV_DATA_END = -10009
+    RDT_ER_REMOTE_ABORT = -10010
+    RDT_ER_LOCAL_ABORT = -10011
+    RDT_ER_CHANNEL_OCCUPIED = -10012
+    RDT_ER_NO_PERMISSION = -10013
+    RDT_ER_INVALID_ARG = -10014
+    RDT_ER_LOCAL_EXIT = -10015
+    RDT_ER_REMOTE_EXIT = -10016
+    RDT_ER_SEND_BUFFER_FULL = -10017
+    RDT_ER_UNCLOSED_CONNECTION_DETECTED = -10018
+    RDT_ER_DEINITIALIZING = -10019
+    RDT_ER_FAIL_INITIALIZE_DTLS = -10020
+    RDT_ER_CREATE_DTLS_FAIL = -10021
+    RDT_ER_OPERATION_IS_INVALID = -10022
+    RDT_ER_REMOTE_NOT_SUPPORT_DTLS = -10023
+    RDT_ER_LOCAL_NOT_SUPPORT_DTLS = -10024
+    AV_ER_INVALID_ARG = -20000
+    AV_ER_BUFPARA_MAXSIZE_INSUFF = -20001
+    AV_ER_EXCEED_MAX_CHANNEL = -20002
+    AV_ER_MEM_INSUFF = -20003
+    AV_ER_FAIL_CREATE_THREAD = -20004
+    AV_ER_EXCEED_MAX_ALARM = -20005
+    AV_ER_EXCEED_MAX_SIZE = -20006
+    AV_ER_SERV_NO_RESPONSE = -20007
+    AV_ER_CLIENT_NO_AVLOGIN = -20008
+    AV_ER_WRONG_VIEWACCorPWD = -20009
+    AV_ER_INVALID_SID = -20010
+    AV_ER_TIMEOUT = -20011
+    AV_ER_DATA_NOREADY = -20012
+    AV_ER_INCOMPLETE_FRAME = -20013
+    AV_ER_LOSED_THIS_FRAME = -20014
+    AV_ER_SESSION_CLOSE_BY_REMOTE = -20015
+    AV_ER_REMOTE_TIMEOUT_DISCONNECT = -20016
+    AV_ER_SERVER_EXIT = -20017
+    AV_ER_CLIENT_EXIT = -20018
+    AV_ER_NOT_INITIALIZED = -20019
+    AV_ER_CLIENT_NOT_SUPPORT = -20020
+    AV_ER_SENDIOCTRL_ALREADY_CALLED = -20021
+    AV_ER_SENDIOCTRL_EXIT = -20022
+    AV_ER_NO_PERMISSION = -20023
+    AV_ER_WRONG_ACCPWD_LENGTH = -20024
+    AV_ER_IOTC_SESSION_CLOSED = -20025
+    AV_ER_IOTC_DEINITIALIZED = -20026
+    AV_ER_IOTC_CHANNEL_IN_USED = -20027
+    AV_ER_WAIT_KEY_FRAME = -20028
+    AV_ER_CLEANBUF_ALREADY_CALLED = -20029
+    AV_ER_SOCKET_QUEUE_FULL = -20030
+    AV_ER_ALREADY_INITIALIZED = -20031
+    AV_ER_DASA_CLEAN_BUFFER = -20032
+    AV_ER_NOT_SUPPORT = -20033
+    AV_ER_FAIL_INITIALIZE_DTLS = -20034
+    AV_ER_FAIL_CREATE_DTLS = -20035
+    AV_ER_REQUEST_ALREADY_CALLED = -20036
+    AV_ER_REMOTE_NOT_SUPPORT = -20037
+    AV_ER_TOKEN_EXCEED_MAX_SIZE = -20038
+    AV_ER_REMOTE_NOT_SUPPORT_DTLS = -20039
+    AV_ER_DTLS_WRONG_PWD = -20040
+    AV_ER_DTLS_AUTH_FAIL = -20041
+    AV_ER_VSAAS_PULLING_NOT_ENABLE = -20042
+    AV_ER_FAIL_CONNECT_TO_VSAAS = -20043
+    AV_ER_PARSE_JSON_FAIL = -20044
+    AV_ER_PUSH_NOTIFICATION_NOT_ENABLE = -20045
+    AV_ER_PUSH_NOTIFICATION_ALREADY_ENABLED = -20046
+    AV_ER_NO_NOTIFICATION_LIST = -20047
+    AV_ER_HTTP_ERROR = -20048
+    AV_ER_LOCAL_NOT_SUPPORT_DTLS = -20049
+    AV_ER_SDK_NOT_SUPPORT_DTLS = -21334
+    TUNNEL_ER_NOT_INITIALIZED = -30000
+    TUNNEL_ER_EXCEED_MAX_SERVICE = -30001
+    TUNNEL_ER_BIND_LOCAL_SERVICE = -30002
+    TUNNEL_ER_LISTEN_LOCAL_SERVICE = -30003
+    TUNNEL_ER_FAIL_CREATE_THREAD = -30004
+    TUNNEL_ER_ALREADY_CONNECTED = -30005
+    TUNNEL_ER_DISCONNECTED = -30006
+    TUNNEL_ER_ALREADY_INITIALIZED = -30007
+    TUNNEL_ER_AUTH_FAILED = -30008
+    TUNNEL_ER_EXCEED_MAX_LEN = -30009
+    TUNNEL_ER_INVALID_SID = -30010
+    TUNNEL_ER_UID_UNLICENSE = -30011
+    TUNNEL_ER_UID_NO_PERMISSION = -30012
+    TUNNEL_ER_UID_NOT_SUPPORT_RELAY = -30013
+    TUNNEL_ER_DEVICE_NOT_ONLINE = -30014
+    TUNNEL_ER_DEVICE_NOT_LISTENING = -30015
+    TUNNEL_ER_NETWORK_UNREACHABLE = -30016
+    TUNNEL_ER_FAILED_SETUP_CONNECTION = -30017
+    TUNNEL_ER_LOGIN_FAILED = -30018
+    TUNNEL_ER_EXCEED_MAX_SESSION = -30019
+    TUNNEL_ER_AGENT_NOT_SUPPORT = -30020
+    TUNNEL_ER_INVALID_ARG = -30021
+    TUNNEL_ER_OS_RESOURCE_LACK = -30022
+    TUNNEL_ER_AGENT_NOT_CONNECTING = -30023
+    TUNNEL_ER_NO_FREE_SESSION = -30024
+    TUNNEL_ER_CONNECTION_CANCELLED = -30025
+    TUNNEL_ER_OPERATION_IS_INVALID = -30026
+    TUNNEL_ER_HANDSHAKE_FAILED = -30027
+    TUNNEL_ER_REMOTE_NOT_SUPPORT_DTLS = -30028
+    TUNNEL_ER_LOCAL_NOT_SUPPORT_DTLS = -30029
+    TUNNEL_ER_TIMEOUT = -30030
+    TUNNEL_ER_UNDEFINED = -31000
+
 
 class TutkError(RuntimeError):
-    name_mapping = {
-        -1: "IOTC_ER_SERVER_NOT_RESPONSE",
-        -2: "IOTC_ER_FAIL_RESOLVE_HOSTNAME",
-        -3: "IOTC_ER_ALREADY_INITIALIZED",
-        -4: "IOTC_ER_FAIL_CREATE_MUTEX",
-        -5: "IOTC_ER_FAIL_CREATE_THREAD",
-        -6: "IOTC_ER_FAIL_CREATE_SOCKET",
-        -7: "IOTC_ER_FAIL_SOCKET_OPT",
-        -8: "IOTC_ER_FAIL_SOCKET_BIND",
-        -10: "IOTC_ER_UNLICENSE",
-        -11: "IOTC_ER_LOGIN_ALREADY_CALLED",
-        -12: "IOTC_ER_NOT_INITIALIZED",
-        -13: "IOTC_ER_TIMEOUT",
-        -14: "IOTC_ER_INVALID_SID",
-        -15: "IOTC_ER_UNKNOWN_DEVICE",
-        -16: "IOTC_ER_FAIL_GET_LOCAL_IP",
-        -17: "IOTC_ER_LISTEN_ALREADY_CALLED",
-        -18: "IOTC_ER_EXCEED_MAX_SESSION",
-        -19: "IOTC_ER_CAN_NOT_FIND_DEVICE",
-        -20: "IOTC_ER_CONNECT_IS_CALLING",
-        -22: "IOTC_ER_SESSION_CLOSE_BY_REMOTE",
-        -23: "IOTC_ER_REMOTE_TIMEOUT_DISCONNECT",
-        -24: "IOTC_ER_DEVICE_NOT_LISTENING",
-        -26: "IOTC_ER_CH_NOT_ON",
-        -27: "IOTC_ER_FAIL_CONNECT_SEARCH",
-        -28: "IOTC_ER_MASTER_TOO_FEW",
-        -29: "IOTC_ER_AES_CERTIFY_FAIL",
-        -31: "IOTC_ER_SESSION_NO_FREE_CHANNEL",
-        -32: "IOTC_ER_TCP_TRAVEL_FAILED",
-        -33: "IOTC_ER_TCP_CONNECT_TO_SERVER_FAILED",
-        -34: "IOTC_ER_CLIENT_NOT_SECURE_MODE",
-        -35: "IOTC_ER_CLIENT_SECURE_MODE",
-        -36: "IOTC_ER_DEVICE_NOT_SECURE_MODE",
-        -37: "IOTC_ER_DEVICE_SECURE_MODE",
-        -38: "IOTC_ER_INVALID_MODE",
-        -39: "IOTC_ER_EXIT_LISTEN",
-        -40: "IOTC_ER_NO_PERMISSION",
-        -41: "IOTC_ER_NETWORK_UNREACHABLE",
-        -42: "IOTC_ER_FAIL_SETUP_RELAY",
-        -43: "IOTC_ER_NOT_SUPPORT_RELAY",
-        -44: "IOTC_ER_NO_SERVER_LIST",
-        -45: "IOTC_ER_DEVICE_MULTI_LOGIN",
-        -46: "IOTC_ER_INVALID_ARG",
-        -47: "IOTC_ER_NOT_SUPPORT_PE",
-        -48: "IOTC_ER_DEVICE_EXCEED_MAX_SESSION",
-        -49: "IOTC_ER_BLOCKED_CALL",
-        -50: "IOTC_ER_SESSION_CLOSED",
-        -51: "IOTC_ER_REMOTE_NOT_SUPPORTED",
-        -52: "IOTC_ER_ABORTED",
-        -53: "IOTC_ER_EXCEED_MAX_PACKET_SIZE",
-        -54: "IOTC_ER_SERVER_NOT_SUPPORT",
-        -55: "IOTC_ER_NO_PATH_TO_WRITE_DATA",
-        -56: "IOTC_ER_SERVICE_IS_NOT_STARTED",
-        -57: "IOTC_ER_STILL_IN_PROCESSING",
-        -58: "IOTC_ER_NOT_ENOUGH_MEMORY",
-        -59: "IOTC_ER_DEVICE_IS_BANNED",
-        -60: "IOTC_ER_MASTER_NOT_RESPONSE",
-        -61: "IOTC_ER_RESOURCE_ERROR",
-        -62: "IOTC_ER_QUEUE_FULL",
-        -63: "IOTC_ER_NOT_SUPPORT",
-        -64: "IOTC_ER_DEVICE_IS_SLEEP",
-        -65: "IOTC_ER_TCP_NOT_SUPPORT",
-        -66: "IOTC_ER_WAKEUP_NOT_INITIALIZED",
-        -67: "IOTC_ER_DEVICE_REJECT_BYPORT",
-        -68: "IOTC_ER_DEVICE_REJECT_BY_WRONG_AUTH_KEY",
-        -69: "IOTC_ER_DEVICE_NOT_USE_KEY_AUTHENTICATION",
-        -70: "IOTC_ER_DID_NOT_LOGIN",
-        -71: "IOTC_ER_DID_NOT_LOGIN_WITH_AUTHKEY",
-        -72: "IOTC_ER_SESSION_IN_USE",
-        -90: "IOTC_ER_DEVICE_OFFLINE",
-        -91: "IOTC_ER_MASTER_INVALID",
-        -1001: "TUTK_ER_ALREADY_INITIALIZED",
-        -1002: "TUTK_ER_INVALID_ARG",
-        -1003: "TUTK_ER_MEM_INSUFFICIENT",
-        -1004: "TUTK_ER_INVALID_LICENSE_KEY",
-        -1005: "TUTK_ER_NO_LICENSE_KEY",
-        -10000: "RDT_ER_NOT_INITIALIZED",
-        -10001: "RDT_ER_ALREADY_INITIALIZED",
-        -10002: "RDT_ER_EXCEED_MAX_CHANNEL",
-        -10003: "RDT_ER_MEM_INSUFF",
-        -10004: "RDT_ER_FAIL_CREATE_THREAD",
-        -10005: "RDT_ER_FAIL_CREATE_MUTEX",
-        -10006: "RDT_ER_RDT_DESTROYED",
-        -10007: "RDT_ER_TIMEOUT",
-        -10008: "RDT_ER_INVALID_RDT_ID",
-        -10009: "RDT_ER_RCV_DATA_END",
-        -10010: "RDT_ER_REMOTE_ABORT",
-        -10011: "RDT_ER_LOCAL_ABORT",
-        -10012: "RDT_ER_CHANNEL_OCCUPIED",
-        -10013: "RDT_ER_NO_PERMISSION",
-        -10014: "RDT_ER_INVALID_ARG",
-        -10015: "RDT_ER_LOCAL_EXIT",
-        -10016: "RDT_ER_REMOTE_EXIT",
-        -10017: "RDT_ER_SEND_BUFFER_FULL",
-        -10018: "RDT_ER_UNCLOSED_CONNECTION_DETECTED",
-        -10019: "RDT_ER_DEINITIALIZING",
-        -10020: "RDT_ER_FAIL_INITIALIZE_DTLS",
-        -10021: "RDT_ER_CREATE_DTLS_FAIL",
-        -10022: "RDT_ER_OPERATION_IS_INVALID",
-        -10023: "RDT_ER_REMOTE_NOT_SUPPORT_DTLS",
-        -10024: "RDT_ER_LOCAL_NOT_SUPPORT_DTLS",
-        -20000: "AV_ER_INVALID_ARG",
-        -20001: "AV_ER_BUFPARA_MAXSIZE_INSUFF",
-        -20002: "AV_ER_EXCEED_MAX_CHANNEL",
-        -20003: "AV_ER_MEM_INSUFF",
-        -20004: "AV_ER_FAIL_CREATE_THREAD",
-        -20005: "AV_ER_EXCEED_MAX_ALARM",
-        -20006: "AV_ER_EXCEED_MAX_SIZE",
-        -20007: "AV_ER_SERV_NO_RESPONSE",
-        -20008: "AV_ER_CLIENT_NO_AVLOGIN",
-        -20009: "AV_ER_WRONG_VIEWACCorPWD",
-        -20010: "AV_ER_INVALID_SID",
-        -20011: "AV_ER_TIMEOUT",
-        -20012: "AV_ER_DATA_NOREADY",
-        -20013: "AV_ER_INCOMPLETE_FRAME",
-        -20014: "AV_ER_LOSED_THIS_FRAME",
-        -20015: "AV_ER_SESSION_CLOSE_BY_REMOTE",
-        -20016: "AV_ER_REMOTE_TIMEOUT_DISCONNECT",
-        -20017: "AV_ER_SERVER_EXIT",
-        -20018: "AV_ER_CLIENT_EXIT",
-        -20019: "AV_ER_NOT_INITIALIZED",
-        -20020: "AV_ER_CLIENT_NOT_SUPPORT",
-        -20021: "AV_ER_SENDIOCTRL_ALREADY_CALLED",
-        -20022: "AV_ER_SENDIOCTRL_EXIT",
-        -20023: "AV_ER_NO_PERMISSION",
-        -20024: "AV_ER_WRONG_ACCPWD_LENGTH",
-        -20025: "AV_ER_IOTC_SESSION_CLOSED",
-        -20026: "AV_ER_IOTC_DEINITIALIZED",
-        -20027: "AV_ER_IOTC_CHANNEL_IN_USED",
-        -20028: "AV_ER_WAIT_KEY_FRAME",
-        -20029: "AV_ER_CLEANBUF_ALREADY_CALLED",
-        -20030: "AV_ER_SOCKET_QUEUE_FULL",
-        -20031: "AV_ER_ALREADY_INITIALIZED",
-        -20032: "AV_ER_DASA_CLEAN_BUFFER",
-        -20033: "AV_ER_NOT_SUPPORT",
-        -20034: "AV_ER_FAIL_INITIALIZE_DTLS",
-        -20035: "AV_ER_FAIL_CREATE_DTLS",
-        -20036: "AV_ER_REQUEST_ALREADY_CALLED",
-        -20037: "AV_ER_REMOTE_NOT_SUPPORT",
-        -20038: "AV_ER_TOKEN_EXCEED_MAX_SIZE",
-        -20039: "AV_ER_REMOTE_NOT_SUPPORT_DTLS",
-        -20040: "AV_ER_DTLS_WRONG_PWD",
-        -20041: "AV_ER_DTLS_AUTH_FAIL",
-        -20042: "AV_ER_VSAAS_PULLING_NOT_ENABLE",
-        -20043: "AV_ER_FAIL_CONNECT_TO_VSAAS",
-        -20044: "AV_ER_PARSE_JSON_FAIL",
-        -20045: "AV_ER_PUSH_NOTIFICATION_NOT_ENABLE",
-        -20046: "AV_ER_PUSH_NOTIFICATION_ALREADY_ENABLED",
-        -20047: "AV_ER_NO_NOTIFICATION_LIST",
-        -20048: "AV_ER_HTTP_ERROR",
-        -20049: "AV_ER_LOCAL_NOT_SUPPORT_DTLS",
-        -21334: "AV_ER_SDK_NOT_SUPPORT_DTLS",
-        -30000: "TUNNEL_ER_NOT_INITIALIZED",
-        -30001: "TUNNEL_ER_EXCEED_MAX_SERVICE",
-        -30002: "TUNNEL_ER_BIND_LOCAL_SERVICE",
-        -30003: "TUNNEL_ER_LISTEN_LOCAL_SERVICE",
-        -30004: "TUNNEL_ER_FAIL_CREATE_THREAD",
-        -30005: "TUNNEL_ER_ALREADY_CONNECTED",
-        -30006: "TUNNEL_ER_DISCONNECTED",
-        -30007: "TUNNEL_ER_ALREADY_INITIALIZED",
-        -30008: "TUNNEL_ER_AUTH_FAILED",
-        -30009: "TUNNEL_ER_EXCEED_MAX_LEN",
-        -30010: "TUNNEL_ER_INVALID_SID",
-        -30011: "TUNNEL_ER_UID_UNLICENSE",
-        -30012: "TUNNEL_ER_UID_NO_PERMISSION",
-        -30013: "TUNNEL_ER_UID_NOT_SUPPORT_RELAY",
-        -30014: "TUNNEL_ER_DEVICE_NOT_ONLINE",
-        -30015: "TUNNEL_ER_DEVICE_NOT_LISTENING",
-        -30016: "TUNNEL_ER_NETWORK_UNREACHABLE",
-        -30017: "TUNNEL_ER_FAILED_SETUP_CONNECTION",
-        -30018: "TUNNEL_ER_LOGIN_FAILED",
-        -30019: "TUNNEL_ER_EXCEED_MAX_SESSION",
-        -30020: "TUNNEL_ER_AGENT_NOT_SUPPORT",
-        -30021: "TUNNEL_ER_INVALID_ARG",
-        -30022: "TUNNEL_ER_OS_RESOURCE_LACK",
-        -30023: "TUNNEL_ER_AGENT_NOT_CONNECTING",
-        -30024: "TUNNEL_ER_NO_FREE_SESSION",
-        -30025: "TUNNEL_ER_CONNECTION_CANCELLED",
-        -30026: "TUNNEL_ER_OPERATION_IS_INVALID",
-        -30027: "TUNNEL_ER_HANDSHAKE_FAILED",
-        -30028: "TUNNEL_ER_REMOTE_NOT_SUPPORT_DTLS",
-        -30029: "TUNNEL_ER_LOCAL_NOT_SUPPORT_DTLS",
-        -30030: "TUNNEL_ER_TIMEOUT",
-        -31000: "TUNNEL_ER_UNDEFINED",
-    }
+    name_mapping = MappingProxyType({code.value: code.name for code in TutkErrorCode})
 
     def __init__(self, code, data=None):
         super().__init__(code)
@@ -303,24 +333,39 @@ class TutkError(RuntimeError):
 
     @property
     def name(self):
-        return TutkError.name_mapping.get(self.code, self.code)
+        return self.name_mapping.get(self.code, self.code)
 
     def __str__(self):
         return self.name
 
 
 class FormattedStructure(Structure):
+    _cache_str = False
+    """Memoize __str__ by the raw struct bytes; for structs logged repeatedly."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_names = tuple(field[0] for field in cls._fields_)
+        cls._field_getter = staticmethod(attrgetter(*cls._field_names))
+
     def __str__(self):
+        if self._cache_str:
+            return _format_struct_bytes(type(self), bytes(self))
+        return self._format()
+
+    def _format(self) -> str:
+        values = self._field_getter(self)
         fields = "\n\t".join(
-            [
-                f"{field[0]}: {getattr(self, field[0])}"
-                for field in self._fields_
-                # if getattr(self, field[0])
-            ]
+            f"{name}: {value}" for name, value in zip(self._field_names, values)
         )
         return f"{self.__class__.__name__}:\n\t{fields}"
 
 
+@lru_cache(maxsize=64)
+def _format_struct_bytes(cls: type[FormattedStructure], raw: bytes) -> str:
+    return cls.from_buffer_copy(raw)._format()
+
+
 class SInfoStructEx(FormattedStructure):
     """
     Result of iotc_session_check(), this struct holds a bunch of diagnostic
@@ -355,6 +400,8 @@ class SInfoStructEx(FormattedStructure):
 
     """
 
+    _cache_str = True
+
     _fields_ = [
         ("size", c_uint32),  # size of the structure
         ("mode", c_uint8),  # 0: P2P mode, 1: Relay mode, 2: LAN mode
@@ -445,6 +492,7 @@ class FrameInfoStruct(FormattedStructure):
     :vartype n_play_token: int
     """
 
+    _pack_ = 1
     _fields_ = [
         ("codec_id", c_uint16),
         ("is_keyframe", c_uint8),
@@ -463,6 +511,7 @@ class FrameInfoStruct(FormattedStructure):
 
 
 class FrameInfo3Struct(FormattedStructure):
+    _pack_ = 1
     _fields_ = [
         ("codec_id", c_uint16),
         ("is_keyframe", c_uint8),
@@ -508,6 +557,24 @@ class St_IOTCConnectInput(FormattedStructure):
     ]
 
 
+# auth_key sits at the same offset in St_IOTCCheckDeviceInput and St_IOTCConnectInput
+_AUTH_KEY_OFFSET = St_IOTCConnectInput.auth_key.offset
+_AUTH_KEY_SIZE = St_IOTCConnectInput.auth_key.size
+
+
+def _set_auth_key(
+    struct: Union[St_IOTCCheckDeviceInput, St_IOTCConnectInput], auth_key: bytes
+) -> None:
+    """Copy auth_key into the fixed `c_char * 8` field with a raw memmove."""
+    if len(auth_key) > _AUTH_KEY_SIZE:
+        raise ValueError(
+            f"auth_key too long ({len(auth_key)} bytes, max {_AUTH_KEY_SIZE})"
+        )
+    field = byref(struct, _AUTH_KEY_OFFSET)
+    memset(field, 0, _AUTH_KEY_SIZE)
+    memmove(field, auth_key, len(auth_key))
+
+
 class LogAttr(FormattedStructure):
     _fields_ = [
         ("path", c_char_p),
@@ -533,6 +600,7 @@ class AVClientStartInConfig(FormattedStructure):
 
 
 class AVClientStartOutConfig(FormattedStructure):
+    _cache_str = True
     _fields_ = [
         ("cb", c_uint32),
         ("server_type", c_uint32),
@@ -543,7 +611,65 @@ class AVClientStartOutConfig(FormattedStructure):
     ]
 
 
-def av_recv_frame_data(tutk_platform_lib: CDLL, av_chan_id: c_int) -> tuple[
+_SINFO_SIZE = sizeof(SInfoStructEx)
+_CHECK_DEVICE_IN_SIZE = sizeof(St_IOTCCheckDeviceInput)
+_CONNECT_INPUT_SIZE = sizeof(St_IOTCConnectInput)
+_AVC_IN_SIZE = sizeof(AVClientStartInConfig)
+_AVC_OUT_SIZE = sizeof(AVClientStartOutConfig)
+
+_FRAME_INFO_BY_SIZE = {
+    sizeof(FrameInfoStruct): FrameInfoStruct,
+    sizeof(FrameInfo3Struct): FrameInfo3Struct,
+}
+
+_FRAME_DATA_MAX_LEN = 800_000
+_FRAME_INFO_MAX_LEN = 4096
+_AUDIO_DATA_MAX_LEN = 51_200
+_AUDIO_INFO_MAX_LEN = 1024
+_IO_CTRL_MAX_LEN = 50_000
+
+
+class _RecvBuffers:
+    """Receive buffers and out-params reused across calls on the same thread.
+
+    The SDK copies each frame into the buffer we hand it, so one allocation per
+    receiving thread is enough as long as the payload and frame info are copied
+    out before the next call on that thread.
+    """
+
+    __slots__ = (
+        "data",
+        "info",
+        "data_len",
+        "info_len",
+        "frame_index",
+        "data_len_ref",
+        "expected_len_ref",
+        "info_len_ref",
+        "frame_index_ref",
+    )
+
+    def __init__(self, data_max_len: int, info_max_len: int) -> None:
+        self.data = create_string_buffer(data_max_len)
+        self.info = create_string_buffer(info_max_len)
+        self.data_len = c_int32()
+        self.info_len = c_int32()
+        self.frame_index = c_uint()
+        # byref() handles are stable for the lifetime of the buffers
+        self.data_len_ref = byref(self.data_len)
+        self.expected_len_ref = byref(c_int32())
+        self.info_len_ref = byref(self.info_len)
+        self.frame_index_ref = byref(self.frame_index)
+
+
+def _recv_buffers(name: str, data_max_len: int, info_max_len: int) -> _RecvBuffers:
+    if (bufs := getattr(_local, name, None)) is None:
+        bufs = _RecvBuffers(data_max_len, info_max_len)
+        setattr(_local, name, bufs)
+    return bufs
+
+
+def av_recv_frame_data(tutk_platform_lib: CDLL, av_chan_id: int) -> tuple[
     int,
     Optional[bytes],
     Optional[Union[FrameInfoStruct, FrameInfo3Struct]],
@@ -557,39 +683,57 @@ def av_recv_frame_data(tutk_platform_lib: CDLL, av_chan_id: c_int) -> tuple[
     :param av_chan_id: The channel ID of the AV channel to recv data on.
     :return: a 4-tuple of errno, frame_data, frame_info, and frame_index
     """
-    frame_data_max_len = 800_000
-    frame_info_max_len = 4096
+    errno, frame_view, frame_info, frame_index = av_recv_frame_view(
+        tutk_platform_lib, av_chan_id
+    )
+    if frame_view is None:
+        return errno, None, None, None
+
+    return errno, frame_view.tobytes(), frame_info, frame_index
+
+
+def av_recv_frame_view(tutk_platform_lib: CDLL, av_chan_id: int) -> tuple[
+    int,
+    Optional[memoryview],
+    Optional[Union[FrameInfoStruct, FrameInfo3Struct]],
+    Optional[int],
+]:
+    """Receive frame data without copying it out of the receive buffer.
 
-    frame_data_buffer = create_string_buffer(frame_data_max_len)
-    frame_info_buffer = create_string_buffer(frame_info_max_len)
+    Same as `av_recv_frame_data`, but frame_data is a memoryview into the
+    reused per-thread receive buffer. The view is only valid until the next
+    receive on the same thread, so write it out (e.g. to the ffmpeg pipe)
+    before asking for the next frame.
 
-    frame_data_actual_len = c_int32()
-    frame_data_expected_len = c_int32()
-    frame_info_actual_len = c_int32()
-    frame_index = c_uint()
+    :param tutk_platform_lib: the c library loaded from the 'load_library' call.
+    :param av_chan_id: The channel ID of the AV channel to recv data on.
+    :return: a 4-tuple of errno, frame_data, frame_info, and frame_index
+    """
+    bufs = _recv_buffers("video", _FRAME_DATA_MAX_LEN, _FRAME_INFO_MAX_LEN)
 
     errno = tutk_platform_lib.avRecvFrameData2(
         av_chan_id,
-        frame_data_buffer,
-        frame_data_max_len,
-        byref(frame_data_actual_len),
-        byref(frame_data_expected_len),
-        frame_info_buffer,
-        frame_info_max_len,
-        byref(frame_info_actual_len),
-        byref(frame_index),
+        bufs.data,
+        _FRAME_DATA_MAX_LEN,
+        bufs.data_len_ref,
+        bufs.expected_len_ref,
+        bufs.info,
+        _FRAME_INFO_MAX_LEN,
+        bufs.info_len_ref,
+        bufs.frame_index_ref,
     )
 
     if errno < 0:
         return errno, None, None, None
 
-    frame_data = memoryview(frame_data_buffer)[: frame_data_actual_len.value].tobytes()
-    frame_info = cast(frame_info_buffer, POINTER(FrameInfoStruct)).contents
+    frame_data = memoryview(bufs.data)[: bufs.data_len.value]
+    info_cls = _FRAME_INFO_BY_SIZE.get(bufs.info_len.value, FrameInfoStruct)
+    frame_info = info_cls.from_buffer_copy(bufs.info)
 
-    return 0, frame_data, frame_info, frame_index.value
+    return 0, frame_data, frame_info, bufs.frame_index.value
 
 
-def av_recv_audio_data(tutk_platform_lib: CDLL, av_chan_id: c_int):
+def av_recv_audio_data(tutk_platform_lib: CDLL, av_chan_id: int):
     """An AV client receives audio data from an AV server.
 
     An AV client uses this function to receive audio data from AV server
@@ -598,39 +742,33 @@ def av_recv_audio_data(tutk_platform_lib: CDLL, av_chan_id: c_int):
     :param av_chan_id: The channel ID of the AV channel to recv data on.
     :return: a 4-tuple of errno, audio_data, frame_info, and frame_index
     """
-
-    audio_data_max_size = 51_200
-    frame_info_max_size = 1024
-
-    audio_data_buffer = create_string_buffer(audio_data_max_size)
-    frame_info_buffer = create_string_buffer(frame_info_max_size)
-    frame_index = c_uint32()
+    bufs = _recv_buffers("audio", _AUDIO_DATA_MAX_LEN, _AUDIO_INFO_MAX_LEN)
 
     frame_len = tutk_platform_lib.avRecvAudioData(
         av_chan_id,
-        audio_data_buffer,
-        audio_data_max_size,
-        frame_info_buffer,
-        frame_info_max_size,
-        byref(frame_index),
+        bufs.data,
+        _AUDIO_DATA_MAX_LEN,
+        bufs.info,
+        _AUDIO_INFO_MAX_LEN,
+        bufs.frame_index_ref,
     )
 
     if frame_len < 0:
         return frame_len, None, None
 
-    audio_data = memoryview(audio_data_buffer)[:frame_len].tobytes()
-    frame_info = cast(frame_info_buffer, POINTER(FrameInfo3Struct)).contents
+    audio_data = memoryview(bufs.data)[:frame_len].tobytes()
+    frame_info = FrameInfo3Struct.from_buffer_copy(bufs.info)
 
     return 0, audio_data, frame_info
 
 
-def av_check_audio_buf(tutk_platform_lib: CDLL, av_chan_id: c_int) -> int:
+def av_check_audio_buf(tutk_platform_lib: CDLL, av_chan_id: int) -> int:
     """Get the frame count of audio buffer remaining in the queue."""
     return tutk_platform_lib.avCheckAudioBuf(av_chan_id)
 
 
 def av_recv_io_ctrl(
-    tutk_platform_lib: CDLL, av_chan_id: c_int, timeout_ms: int
+    tutk_platform_lib: CDLL, av_chan_id: int, timeout_ms: int
 ) -> tuple[int, int, Optional[bytes]]:
     """Receive AV IO control.
 
@@ -641,12 +779,11 @@ def av_recv_io_ctrl(
     :returns: a tuple of (the length of the io_ctrl received (or error number),
               the io_ctrl_type, and the data in bytes)
     """
-    pn_io_ctrl_type = c_uint()
-    ctl_data_len = 50_000
-    ctl_buffer = create_string_buffer(ctl_data_len)
+    if (ctl_buffer := getattr(_local, "io_ctrl", None)) is None:
+        ctl_buffer = _local.io_ctrl = create_string_buffer(_IO_CTRL_MAX_LEN)
 
-    frame_len = tutk_platform_lib.avRecvIOCtrl(
-        av_chan_id, byref(pn_io_ctrl_type), ctl_buffer, ctl_data_len, timeout_ms
+    frame_len, io_ctrl_type = av_recv_io_ctrl_into(
+        tutk_platform_lib, av_chan_id, ctl_buffer, _IO_CTRL_MAX_LEN, timeout_ms
     )
 
     if frame_len < 0:
@@ -654,7 +791,40 @@ def av_recv_io_ctrl(
 
     data = memoryview(ctl_buffer)[:frame_len].tobytes()
 
-    return frame_len, pn_io_ctrl_type.value, data
+    return frame_len, io_ctrl_type, data
+
+
+def av_recv_io_ctrl_into(
+    tutk_platform_lib: CDLL,
+    av_chan_id: int,
+    ctl_buffer: Array[c_char],
+    buffer_len: int,
+    timeout_ms: int,
+) -> tuple[int, int]:
+    """Receive AV IO control into a caller-owned buffer.
+
+    Same as `av_recv_io_ctrl`, but the message is left in `ctl_buffer` for the
+    caller to decode in place, e.g. by a listener that owns its buffer for the
+    lifetime of the connection.
+
+    :param tutk_platform_lib: the c library loaded from the 'load_library' call.
+    :param av_chan_id: The channel ID of the AV channel to receive on
+    :param ctl_buffer: a buffer from `create_string_buffer` to receive into
+    :param buffer_len: the usable size of ctl_buffer
+    :param timeout_ms: the number of milliseconds to wait before timing out
+    :returns: a tuple of (the length of the io_ctrl received (or error number),
+              the io_ctrl_type)
+    """
+    if (type_out := getattr(_local, "io_ctrl_type", None)) is None:
+        io_ctrl_type = c_uint()
+        type_out = _local.io_ctrl_type = io_ctrl_type, byref(io_ctrl_type)
+    io_ctrl_type, io_ctrl_type_ref = type_out
+
+    frame_len = tutk_platform_lib.avRecvIOCtrl(
+        av_chan_id, io_ctrl_type_ref, ctl_buffer, buffer_len, timeout_ms
+    )
+
+    return frame_len, io_ctrl_type.value
 
 
 def av_client_set_max_buf_size(tutk_platform_lib: CDLL, size: int) -> None:
@@ -666,11 +836,11 @@ def av_client_set_max_buf_size(tutk_platform_lib: CDLL, size: int) -> None:
     :param tutk_platform_lib: the c library loaded from the 'load_library' call.
     :param size: The maximum video frame buffer, in unit of kilo-byte
     """
-    tutk_platform_lib.avClientSetMaxBufSize(c_int(size))
+    tutk_platform_lib.avClientSetMaxBufSize(size)
 
 
 def av_client_set_recv_buf_size(
-    tutk_platform_lib: CDLL, channel_id: c_int, size: int
+    tutk_platform_lib: CDLL, channel_id: int, size: int
 ) -> None:
     """Set the maximum frame buffer size used in AV client with specific AV channel ID.
 
@@ -682,10 +852,10 @@ def av_client_set_recv_buf_size(
     :param channel_id: The channel ID of the AV channel to setup max buffer size
     :param size: The maximum video frame buffer, in unit of kilo-byte
     """
-    tutk_platform_lib.avClientSetRecvBufMaxSize(channel_id, c_uint(size))
+    tutk_platform_lib.avClientSetRecvBufMaxSize(channel_id, size)
 
 
-def av_client_clean_buf(tutk_platform_lib: CDLL, channel_id: c_int) -> None:
+def av_client_clean_buf(tutk_platform_lib: CDLL, channel_id: int) -> None:
     """Clean the video buffer both in client and device, and clean the audio buffer of the client.
 
     A client with multiple device connection application should call
@@ -697,7 +867,7 @@ def av_client_clean_buf(tutk_platform_lib: CDLL, channel_id: c_int) -> None:
     tutk_platform_lib.avClientCleanBuf(channel_id)
 
 
-def av_client_clean_local_buf(tutk_platform_lib: CDLL, channel_id: c_int) -> None:
+def av_client_clean_local_buf(tutk_platform_lib: CDLL, channel_id: int) -> None:
     """Clean the local video and audio buffer of the client.
 
     This function is used to clean the video and audio buffer that the client
@@ -708,7 +878,7 @@ def av_client_clean_local_buf(tutk_platform_lib: CDLL, channel_id: c_int) -> Non
     tutk_platform_lib.avClientCleanLocalBuf(channel_id)
 
 
-def av_client_clean_local_video_buf(tutk_platform_lib: CDLL, channel_id: c_int) -> None:
+def av_client_clean_local_video_buf(tutk_platform_lib: CDLL, channel_id: int) -> None:
     """Clean the local video buffer of the client.
 
     This function is used to clean the video buffer that the client
@@ -719,7 +889,7 @@ def av_client_clean_local_video_buf(tutk_platform_lib: CDLL, channel_id: c_int)
     tutk_platform_lib.avClientCleanLocalVideoBuf(channel_id)
 
 
-def av_client_clean_local_audio_buf(tutk_platform_lib: CDLL, channel_id: c_int) -> None:
+def av_client_clean_local_audio_buf(tutk_platform_lib: CDLL, channel_id: int) -> None:
     """Clean the local audio buffer of the client.
 
     This function is used to clean the audio buffer that the client
@@ -730,7 +900,7 @@ def av_client_clean_local_audio_buf(tutk_platform_lib: CDLL, channel_id: c_int)
     tutk_platform_lib.avClientCleanAudioBuf(channel_id)
 
 
-def av_client_stop(tutk_platform_lib: CDLL, av_chan_id: c_int) -> None:
+def av_client_stop(tutk_platform_lib: CDLL, av_chan_id: int) -> None:
     """Stop an AV client.
 
     An AV client stop AV channel by this function if this channel is no longer
@@ -742,20 +912,24 @@ def av_client_stop(tutk_platform_lib: CDLL, av_chan_id: c_int) -> None:
     tutk_platform_lib.avClientStop(av_chan_id)
 
 
-def av_send_io_ctrl_exit(tutk_platform_lib: CDLL, av_chan_id: c_int) -> None:
+def av_send_io_ctrl_exit(tutk_platform_lib: CDLL, av_chan_id: int) -> None:
     tutk_platform_lib.avSendIOCtrlExit(av_chan_id)
 
 
 def av_send_io_ctrl(
     tutk_platform_lib: CDLL, av_chan_id: int, ctrl_type: int, data: Optional[bytes]
 ) -> int:
-    length = len(data) if data else 0
-    cdata = c_char_p(data) if data else None
+    """Send AV IO control.
 
-    return tutk_platform_lib.avSendIOCtrl(av_chan_id, c_uint(ctrl_type), cdata, length)
+    The payload is handed to the SDK as a pointer into the bytes object plus an
+    explicit length, so it is neither copied nor scanned for a NUL terminator.
+    """
+    if not data:
+        return tutk_platform_lib.avSendIOCtrl(av_chan_id, ctrl_type, None, 0)
+    return tutk_platform_lib.avSendIOCtrl(av_chan_id, ctrl_type, data, len(data))
 
 
-def iotc_session_close(tutk_platform_lib: CDLL, session_id: c_int) -> None:
+def iotc_session_close(tutk_platform_lib: CDLL, session_id: int) -> None:
     """Used by a device or a client to close a IOTC session.
 
     A device or a client uses this function to close a IOTC session specified
@@ -769,13 +943,13 @@ def iotc_session_close(tutk_platform_lib: CDLL, session_id: c_int) -> None:
 
 def av_client_start(
     tutk_platform_lib: CDLL,
-    session_id: Union[int, c_int],
+    session_id: int,
     username: bytes,
     password: bytes,
     timeout_secs: int,
     channel_id: int,
     resend: int,
-) -> tuple[c_int, c_uint]:
+) -> int:
     """Start an AV client.
 
     Start an AV client by providing view account and password. It shall pass
@@ -790,13 +964,10 @@ def av_client_start(
                          and this process will exit immediately if not connection
                          is unsuccessful.
     :param channel_id: The channel ID of the channel to start AV client
-    :return: returns a tuple of two values:
-             - av_chan_id: AV channel ID if return value >= 0; error code if return value < 0
-             - pn_serv_type: The user-defined service type set when an AV server starts. Can be NULL.
+    :return: AV channel ID if return value >= 0; error code if return value < 0
     """
 
-    avc_in = AVClientStartInConfig()
-    avc_in.cb = sizeof(avc_in)
+    avc_in = AVClientStartInConfig(cb=_AVC_IN_SIZE)
     avc_in.iotc_session_id = session_id
     avc_in.iotc_channel_id = channel_id
     avc_in.timeout_sec = timeout_secs
@@ -805,13 +976,12 @@ def av_client_start(
     avc_in.resend = resend
     avc_in.security_mode = 2
 
-    avc_out = AVClientStartOutConfig()
-    avc_out.cb = sizeof(avc_out)
+    avc_out = AVClientStartOutConfig(cb=_AVC_OUT_SIZE)
 
     return tutk_platform_lib.avClientStartEx(byref(avc_in), byref(avc_out))
 
 
-def av_initialize(tutk_platform_lib: CDLL, max_num_channels: c_int = 1) -> int:
+def av_initialize(tutk_platform_lib: CDLL, max_num_channels: int = 1) -> int:
     """Initialize AV module.
 
     This function is used by AV servers or AV clients to initialize AV module
@@ -840,7 +1010,7 @@ def av_deinitialize(tutk_platform_lib: CDLL) -> int:
 
 
 def iotc_session_check(
-    tutk_platform_lib: CDLL, session_id: c_int
+    tutk_platform_lib: CDLL, session_id: int
 ) -> tuple[int, SInfoStructEx]:
     """Used by a device or a client to check the IOTC session info.
 
@@ -851,13 +1021,12 @@ def iotc_session_check(
     :param session_id: The session ID of the IOTC session to be checked
     :return: The session info of specified IOTC session
     """
-    sess_info = SInfoStructEx()
-    sess_info.size = sizeof(sess_info)
+    sess_info = SInfoStructEx(size=_SINFO_SIZE)
     err_code = tutk_platform_lib.IOTC_Session_Check_Ex(session_id, byref(sess_info))
     return err_code, sess_info
 
 
-def iotc_connect_by_uid(tutk_platform_lib: CDLL, p2p_id: str) -> c_int:
+def iotc_connect_by_uid(tutk_platform_lib: CDLL, p2p_id: Union[str, bytes], /) -> int:
     """Used by a client to connect a device.
 
     This function is for a client to connect a device by specifying the UID of
@@ -866,51 +1035,53 @@ def iotc_connect_by_uid(tutk_platform_lib: CDLL, p2p_id: str) -> c_int:
     client can communicate for the other later by using this IOTC session ID.
 
     :param tutk_platform_lib: The underlying c library (from tutk.load_library())
-    :param p2p_id: The UID of a device that client wants to connect
+    :param p2p_id: The UID of a device that client wants to connect, as str or pre-encoded bytes
     :return: IOTC session ID if return value >= 0, error code if return value < 0
     """
-    session_id: c_int = tutk_platform_lib.IOTC_Connect_ByUID(
-        c_char_p(p2p_id.encode("ascii"))
-    )
+    session_id: int = tutk_platform_lib.IOTC_Connect_ByUID(_encode_uid(p2p_id))
     return session_id
 
 
-def iotc_get_session_id(tutk_platform_lib: CDLL) -> c_int:
+def iotc_get_session_id(tutk_platform_lib: CDLL) -> int:
     """Used by a client to get a tutk_platform_free session ID.
 
     This function is for a client to get a tutk_platform_free
     session ID used for a parameter of iotc_connect_by_uid_parallel()
     """
-    session_id: c_int = tutk_platform_lib.IOTC_Get_SessionID()
+    session_id: int = tutk_platform_lib.IOTC_Get_SessionID()
     return session_id
 
 
 def iotc_check_device_online(
     tutk_platform_lib: CDLL,
-    p2p_id: str,
+    p2p_id: Union[str, bytes],
     auth_key: bytes,
+    /,
     timeout_ms: int = 5000,
-) -> tuple[c_int, St_IOTCCheckDeviceOutput]:
+) -> tuple[int, St_IOTCCheckDeviceOutput]:
     """Checking device online or not."""
-    device_in = St_IOTCCheckDeviceInput()
-    device_in.cb = sizeof(device_in)
-    device_in.auth_key = auth_key
+    device_in = getattr(_local, "check_device_in", None)
+    if device_in is None:
+        device_in = St_IOTCCheckDeviceInput(cb=_CHECK_DEVICE_IN_SIZE)
+        _local.check_device_in = device_in
+    if device_in.auth_key != auth_key:
+        _set_auth_key(device_in, auth_key)
 
     device_out = St_IOTCCheckDeviceOutput()
 
-    status: c_int = tutk_platform_lib.IOTC_Check_Device_OnlineEx(
-        c_char_p(p2p_id.encode("ascii")),
+    status: int = tutk_platform_lib.IOTC_Check_Device_OnlineEx(
+        _encode_uid(p2p_id),
         byref(device_in),
         byref(device_out),
-        c_uint(timeout_ms),
-        c_int32(),
+        timeout_ms,
+        None,
     )
     return status, device_out
 
 
 def iotc_connect_by_uid_parallel(
-    tutk_platform_lib: CDLL, p2p_id: str, session_id: c_int
-) -> c_int:
+    tutk_platform_lib: CDLL, p2p_id: Union[str, bytes], session_id: int, /
+) -> int:
     """Used by a client to connect a device and bind to a specified session ID.
 
     This function is for a client to connect a device by specifying the UID of that device,
@@ -921,23 +1092,24 @@ def iotc_connect_by_uid_parallel(
     be processed concurrently.
 
     :param tutk_platform_lib: The underlying c library (from tutk.load_library())
-    :param p2p_id: The UID of a device that client wants to connect
+    :param p2p_id: The UID of a device that client wants to connect, as str or pre-encoded bytes
     :param session_id: The Session ID got from IOTC_Get_SessionID() the connection should bind to.
     :return: IOTC session ID if return value >= 0, error code if return value < 0
     """
-    resultant_session_id: c_int = tutk_platform_lib.IOTC_Connect_ByUID_Parallel(
-        c_char_p(p2p_id.encode("ascii")), session_id
+    resultant_session_id: int = tutk_platform_lib.IOTC_Connect_ByUID_Parallel(
+        _encode_uid(p2p_id), session_id
     )
     return resultant_session_id
 
 
 def iotc_connect_by_uid_ex(
     tutk_platform_lib: CDLL,
-    p2p_id: str,
-    session_id: c_int,
-    auth_key: str,
+    p2p_id: Union[str, bytes],
+    session_id: int,
+    auth_key: Union[str, bytes],
+    /,
     timeout: int = 20,
-) -> c_int:
+) -> int:
     """Used by a client to connect a device.
 
     This function is for a client to connect a device by specifying
@@ -947,23 +1119,20 @@ def iotc_connect_by_uid_ex(
     later by using this IOTC session ID.This function will wake up device if it's sleeping.
 
     :param tutk_platform_lib: The underlying c library (from tutk.load_library())
-    :param p2p_id: The UID of a device that client wants to connect
+    :param p2p_id: The UID of a device that client wants to connect, as str or pre-encoded bytes
     :param session_id: The Session ID got from IOTC_Get_SessionID() the connection should bind to.
     :return: IOTC session ID if return value >= 0, error code if return value < 0
     """
-    connect_input = St_IOTCConnectInput()
-    connect_input.cb = sizeof(connect_input)
-    connect_input.auth_key = auth_key.encode()
+    connect_input = St_IOTCConnectInput(cb=_CONNECT_INPUT_SIZE)
+    _set_auth_key(connect_input, _as_bytes(auth_key))
     connect_input.timeout = timeout
 
     return tutk_platform_lib.IOTC_Connect_ByUIDEx(
-        p2p_id.encode(), session_id, byref(connect_input)
+        _encode_uid(p2p_id), session_id, byref(connect_input)
     )
 
 
-def iotc_connect_stop_by_session_id(
-    tutk_platform_lib: CDLL, session_id: c_int
-) -> c_int:
+def iotc_connect_stop_by_session_id(tutk_platform_lib: CDLL, session_id: int) -> int:
     """
     Used by a client to stop a specific session connecting a device.
 
@@ -976,25 +1145,28 @@ def iotc_connect_stop_by_session_id(
     :param session_id: The Session ID got from IOTC_Get_SessionID() the connection should bind to.
     :return: Error code if return value < 0, otherwise 0 if successful
     """
-    errno: c_int = tutk_platform_lib.IOTC_Connect_Stop_BySID(session_id)
+    errno: int = tutk_platform_lib.IOTC_Connect_Stop_BySID(session_id)
     return errno
 
 
-def iotc_set_log_path(tutk_platform_lib: CDLL, path: str) -> None:
+def iotc_set_log_path(tutk_platform_lib: CDLL, path: Union[str, bytes]) -> None:
     """DEPRECATED
     Set path of log file.
 
-    Set the absolute path of log file
+    Set the absolute path of log file. This is a no-op unless `LOG_PATH_ENABLED`
+    is set; use `iotc_set_log_attr` instead.
     """
-    tutk_platform_lib.IOTC_Set_Log_Path(c_char_p(path.encode("ascii")), c_int(0))
+    if not LOG_PATH_ENABLED:
+        return
+    tutk_platform_lib.IOTC_Set_Log_Path(_as_bytes(path), 0)
 
 
 def iotc_set_log_attr(
     tutk_platform_lib: CDLL,
-    path: str,
-    log_level: c_int = 0,
-    max_size: c_int = 0,
-    max_count: c_int = 0,
+    path: Union[str, bytes],
+    log_level: int = 0,
+    max_size: int = 0,
+    max_count: int = 0,
 ) -> int:
     """
     Set Attribute of log file
@@ -1005,7 +1177,7 @@ def iotc_set_log_attr(
     :param file_max_count: The maximum number of log file if file_max_size is set, 0 = unlimited
     """
     log_attr = LogAttr()
-    log_attr.path = path.encode("ascii")
+    log_attr.path = _as_bytes(path)
     log_attr.log_level = log_level
     log_attr.file_max_size = max_size
     log_attr.file_max_count = max_count
@@ -1014,12 +1186,14 @@ def iotc_set_log_attr(
     return errno
 
 
-def iotc_get_version(tutk_platform_lib: CDLL) -> int:
+@lru_cache(maxsize=1)
+def iotc_get_version(tutk_platform_lib: CDLL) -> str:
     """Get the version of IOTC module.
 
-    This function returns the version of IOTC module.
+    This function returns the version of IOTC module. The version can't change
+    while the library is loaded, so it is only read from the library once.
     """
-    return tutk_platform_lib.IOTC_Get_Version_String()
+    return tutk_platform_lib.IOTC_Get_Version_String().decode("ascii")
 
 
 def iotc_initialize(tutk_platform_lib: CDLL, udp_port: int = 0) -> int:
@@ -1040,18 +1214,16 @@ def iotc_initialize(tutk_platform_lib: CDLL, udp_port: int = 0) -> int:
     :return: 0 if successful, Error code if return value < 0
     """
 
-    errno: int = tutk_platform_lib.IOTC_Initialize2(c_uint16(udp_port))
+    errno: int = tutk_platform_lib.IOTC_Initialize2(udp_port)
     return errno
 
 
-def TUTK_SDK_Set_License_Key(tutk_platform_lib: CDLL, key: str) -> int:
-    errno: int = tutk_platform_lib.TUTK_SDK_Set_License_Key(
-        c_char_p(key.encode("ascii"))
-    )
+def TUTK_SDK_Set_License_Key(tutk_platform_lib: CDLL, key: Union[str, bytes]) -> int:
+    errno: int = tutk_platform_lib.TUTK_SDK_Set_License_Key(_as_bytes(key))
     return errno
 
 
-def iotc_deinitialize(tutk_platform_lib: CDLL) -> c_int:
+def iotc_deinitialize(tutk_platform_lib: CDLL) -> int:
     """Deinitialize IOTC module.
 
     This function will deinitialize IOTC module.
@@ -1059,16 +1231,106 @@ def iotc_deinitialize(tutk_platform_lib: CDLL) -> c_int:
     :param tutk_platform_lib: The underlying c library (from tutk.load_library())
     :return: Error code if return value < 0
     """
-    errno: c_int = tutk_platform_lib.IOTC_DeInitialize()
+    errno: int = tutk_platform_lib.IOTC_DeInitialize()
     return errno
 
 
+_PROTOTYPES = (
+    # (function name, argtypes, restype)
+    (
+        "avRecvFrameData2",
+        [
+            c_int,
+            c_char_p,
+            c_int,
+            POINTER(c_int),
+            POINTER(c_int),
+            c_char_p,
+            c_int,
+            POINTER(c_int),
+            POINTER(c_uint),
+        ],
+        c_int,
+    ),
+    (
+        "avRecvAudioData",
+        [c_int, c_char_p, c_int, c_char_p, c_int, POINTER(c_uint)],
+        c_int,
+    ),
+    ("avCheckAudioBuf", [c_int], c_int),
+    ("avRecvIOCtrl", [c_int, POINTER(c_uint), c_char_p, c_int, c_uint], c_int),
+    ("avSendIOCtrl", [c_int, c_uint, c_char_p, c_int], c_int),
+    ("avSendIOCtrlExit", [c_int], c_int),
+    ("avClientSetMaxBufSize", [c_uint], None),
+    ("avClientSetRecvBufMaxSize", [c_int, c_uint], c_int),
+    ("avClientCleanBuf", [c_int], c_int),
+    ("avClientCleanLocalBuf", [c_int], c_int),
+    ("avClientCleanLocalVideoBuf", [c_int], c_int),
+    ("avClientCleanAudioBuf", [c_int], c_int),
+    ("avClientStop", [c_int], None),
+    (
+        "avClientStartEx",
+        [POINTER(AVClientStartInConfig), POINTER(AVClientStartOutConfig)],
+        c_int,
+    ),
+    ("avInitialize", [c_int], c_int),
+    ("avDeInitialize", [], c_int),
+    ("IOTC_Session_Check_Ex", [c_int, POINTER(SInfoStructEx)], c_int),
+    ("IOTC_Session_Close", [c_int], None),
+    ("IOTC_Get_SessionID", [], c_int),
+    ("IOTC_Connect_ByUID", [c_char_p], c_int),
+    ("IOTC_Connect_ByUID_Parallel", [c_char_p, c_int], c_int),
+    ("IOTC_Connect_ByUIDEx", [c_char_p, c_int, POINTER(St_IOTCConnectInput)], c_int),
+    ("IOTC_Connect_Stop_BySID", [c_int], c_int),
+    (
+        "IOTC_Check_Device_OnlineEx",
+        [
+            c_char_p,
+            POINTER(St_IOTCCheckDeviceInput),
+            POINTER(St_IOTCCheckDeviceOutput),
+            c_uint,
+            POINTER(c_int),
+        ],
+        c_int,
+    ),
+    ("IOTC_Set_Log_Path", [c_char_p, c_int], None),
+    ("IOTC_Set_Log_Attr", [POINTER(LogAttr)], c_int),
+    ("IOTC_Get_Version_String", [], c_char_p),
+    ("IOTC_Initialize2", [c_uint16], c_int),
+    ("IOTC_DeInitialize", [], c_int),
+    ("TUTK_SDK_Set_License_Key", [c_char_p], c_int),
+    ("TUTK_SDK_Set_Region", [c_int], c_int),
+)
+"""SDK functions used by the bridge, with their ctypes prototypes."""
+
+
+def _install_prototypes(tutk_platform_lib: CDLL) -> None:
+    """Declare argtypes/restype for the SDK functions used by the bridge.
+
+    With a prototype in place ctypes converts each argument with the declared
+    type instead of guessing from the Python object on every call.
+    """
+    for name, argtypes, restype in _PROTOTYPES:
+        # not every SDK build exports every function, e.g. the deprecated log path
+        if (func := getattr(tutk_platform_lib, name, None)) is None:
+            continue
+        func.argtypes = argtypes
+        func.restype = restype
+
+
 def load_library(shared_lib_path: Optional[str] = None) -> CDLL:
     """Load the underlying iotc library
 
+    The library is loaded as a `CDLL` (never a `PyDLL`), so the GIL is released
+    for the duration of every call into the SDK. This matters for the blocking
+    calls, e.g. `IOTC_Connect_ByUID_Parallel` or `avRecvIOCtrl`, which can take
+    seconds and would otherwise stall every other thread in the process.
+
     :param shared_lib_path: the path to the shared library libIOTCAPIs_ALL
     :return: the tutk_platform_lib, suitable for passing to other functions in this module
     """
     if not shared_lib_path:
         shared_lib_path = "/usr/local/lib/libIOTCAPIs_ALL.so"
-    return cdll.LoadLibrary(shared_lib_path)
+    tutk_platform_lib = CDLL(shared_lib_path, mode=os.RTLD_NOW, use_errno=False)
+    _install_prototypes(tutk_platform_lib)
+    return tutk_platform_lib
@@ -1,17 +1,15 @@
-import contextlib
 import logging
 import threading
 import time
-from collections import defaultdict
-from ctypes import CDLL, c_int
-from queue import Empty, Queue
-from typing import Any, DefaultDict, Optional, Union
+from collections import defaultdict, deque
+from ctypes import CDLL, create_string_buffer
+from queue import Empty
+from typing import Any, Callable, DefaultDict, Optional, Union
 
 from . import tutk, tutk_protocol
 from .tutk_protocol import TutkWyzeProtocolMessage
 
-STOP_SENTINEL = object()
-CONTROL_CHANNEL = "CONTROL"
+RECV_BUFFER_LEN = 50_000
 
 logger = logging.getLogger(__name__)
 
@@ -29,19 +27,40 @@ class TutkIOCtrlFuture:
     :var resp_data: The raw message sent from the camera to the client
     """
 
+    __slots__ = (
+        "req",
+        "expected_response_code",
+        "errcode",
+        "io_ctl_type",
+        "resp_protocol",
+        "resp_data",
+        "_responded",
+        "_discard",
+    )
+
     def __init__(
         self,
         req: TutkWyzeProtocolMessage,
-        queue: Optional[Queue[Union[object, tuple[int, int, int, bytes]]]] = None,
-        errcode: Optional[c_int] = None,
+        errcode: Optional[int] = None,
+        discard: Optional[Callable[["TutkIOCtrlFuture"], None]] = None,
     ):
         self.req: TutkWyzeProtocolMessage = req
-        self.queue = queue
         self.expected_response_code = req.expected_response_code
-        self.errcode: Optional[c_int] = errcode
+        self.errcode: Optional[int] = errcode
         self.io_ctl_type: Optional[int] = None
         self.resp_protocol: Optional[int] = None
         self.resp_data: Optional[bytes] = None
+        self._responded = threading.Event()
+        self._discard = discard
+
+    def set_response(
+        self, io_ctl_type: int, resp_protocol: int, resp_data: bytes
+    ) -> None:
+        """Called by the listener thread with the camera's response to `req`."""
+        self.io_ctl_type = io_ctl_type
+        self.resp_protocol = resp_protocol
+        self.resp_data = resp_data
+        self._responded.set()
 
     def result(self, block: bool = True, timeout: int = 10000) -> Optional[Any]:
         """
@@ -62,20 +81,14 @@ class TutkIOCtrlFuture:
         if self.expected_response_code is None:
             logger.warning("no response code!")
             return
-        assert self.queue is not None, "Future created without error nor queue!"
-
-        msg = self.queue.get(block=block, timeout=timeout)
-        assert isinstance(msg, tuple), "Expected a iotc result, instead got sentinel!"
-        actual_len, io_ctl_type, resp_protocol, data = msg
+        if not self._responded.wait(timeout if block else 0):
+            # stop waiting, or the next response with this code would be handed to us
+            if self._discard:
+                self._discard(self)
+            if not self._responded.is_set():
+                raise Empty
 
-        if actual_len < 0:
-            raise tutk.TutkError(self.errcode)
-
-        self.io_ctl_type = io_ctl_type
-        self.resp_protocol = resp_protocol
-        self.resp_data = data
-
-        return self.req.parse_response(data)
+        return self.req.parse_response(self.resp_data)
 
     def __repr__(self):
         errcode_str = f" errcode={self.errcode}" if self.errcode else ""
@@ -100,11 +113,19 @@ class TutkIOCtrlMux:
     See: [wyzecam.iotc.WyzeIOTCSession.iotctrl_mux][]
     """
 
-    __slots__ = "tutk_platform_lib", "av_chan_id", "queues", "listener", "block"
+    __slots__ = (
+        "tutk_platform_lib",
+        "av_chan_id",
+        "pending",
+        "pending_lock",
+        "stop_event",
+        "listener",
+        "block",
+    )
     _context_lock = threading.Lock()
 
     def __init__(
-        self, tutk_platform_lib: CDLL, av_chan_id: c_int, block: bool = True
+        self, tutk_platform_lib: CDLL, av_chan_id: int, block: bool = True
     ) -> None:
         """Initialize the mux channel.
 
@@ -114,11 +135,15 @@ class TutkIOCtrlMux:
         """
         self.tutk_platform_lib = tutk_platform_lib
         self.av_chan_id = av_chan_id
-        self.queues: DefaultDict[
-            Union[str, int], Queue[Union[object, tuple[int, int, int, bytes]]]
-        ] = defaultdict(Queue)
+        self.pending: DefaultDict[int, deque[TutkIOCtrlFuture]] = defaultdict(deque)
+        self.pending_lock = threading.Lock()
+        self.stop_event = threading.Event()
         self.listener = TutkIOCtrlMuxListener(
-            tutk_platform_lib, av_chan_id, self.queues
+            tutk_platform_lib,
+            av_chan_id,
+            self.pending,
+            self.pending_lock,
+            self.stop_event,
         )
         self.block = block
 
@@ -148,7 +173,7 @@ class TutkIOCtrlMux:
 
         See: [wyzecam.tutk.tutk_ioctl_mux.TutkIOCtrlMux.start_listening][]
         """
-        self.queues[CONTROL_CHANNEL].put(STOP_SENTINEL)
+        self.stop_event.set()
         self.listener.join()
         TutkIOCtrlMux._context_lock.release()
 
@@ -182,21 +207,64 @@ class TutkIOCtrlMux:
 
         :returns: a future promise of a response from the camera.  See [wyzecam.tutk.tutk_ioctl_mux.TutkIOCtrlFuture][]
         """
-        encoded_msg = msg.encode()
-        encoded_msg_header = tutk_protocol.TutkWyzeProtocolHeader.from_buffer_copy(
-            encoded_msg[0:16]
-        )
-        logger.debug("SEND %s %s %s", msg, encoded_msg_header, encoded_msg[16:])
+        return self._send_encoded(msg, msg.encoded, ctrl_type)
+
+    def _send_encoded(
+        self, msg: TutkWyzeProtocolMessage, encoded_msg: bytes, ctrl_type: int
+    ) -> TutkIOCtrlFuture:
+        if logger.isEnabledFor(logging.DEBUG):
+            header = tutk_protocol.ProtocolHeader._make(
+                tutk_protocol.HEADER.unpack_from(encoded_msg)
+            )
+            logger.debug("SEND %s %s %s", msg, header, encoded_msg[16:])
+        code = msg.expected_response_code
+        future = TutkIOCtrlFuture(msg, discard=self._discard if code else None)
+        if code:
+            # register before sending so a quick reply can't beat us to the table
+            with self.pending_lock:
+                self.pending[code].append(future)
         errcode = tutk.av_send_io_ctrl(
             self.tutk_platform_lib, self.av_chan_id, ctrl_type, encoded_msg
         )
         if errcode:
-            return TutkIOCtrlFuture(msg, errcode=errcode)
-        if not msg.expected_response_code:
+            if code:
+                self._discard(future)
+            future.errcode = errcode
+        elif not code:
             logger.warning("no expected response code found")
-            return TutkIOCtrlFuture(msg)
 
-        return TutkIOCtrlFuture(msg, self.queues[msg.expected_response_code])
+        return future
+
+    def _discard(self, future: TutkIOCtrlFuture) -> None:
+        """Stop routing responses to `future`, e.g. after it has timed out."""
+        with self.pending_lock:
+            waiting = self.pending.get(future.expected_response_code)
+            if waiting and future in waiting:
+                waiting.remove(future)
+
+    def send_ioctl_batch(
+        self,
+        msgs: list[TutkWyzeProtocolMessage],
+        ctrl_type: int = tutk.IOTYPE_USER_DEFINED_START,
+    ) -> list[TutkIOCtrlFuture]:
+        """
+        Send several messages back-to-back, returning a future for each.
+
+        All messages are encoded before the first one is sent, so the sends
+        go out without interleaving encoding work. Pair with `waitfor` to
+        collect the responses in any order:
+
+        ```python
+        with session.ioctrl_mux() as mux:
+            resp1, resp2 = mux.waitfor(mux.send_ioctl_batch([msg, msg2]))
+        ```
+        """
+        encoded_msgs = [msg.encoded for msg in msgs]
+        send = self._send_encoded
+        return [
+            send(msg, encoded_msg, ctrl_type)
+            for msg, encoded_msg in zip(msgs, encoded_msgs)
+        ]
 
     def waitfor(
         self,
@@ -232,24 +300,16 @@ class TutkIOCtrlMux:
         if isinstance(futures, TutkIOCtrlFuture):
             futures = [futures]
             unwrap_single_item = True
-        results = [None] * len(futures)
-        start = time.time()
-        while (timeout is None or time.time() - start <= timeout) and any(
-            result is None for result in results
-        ):
-            all_success = True
-            for i, future in enumerate(futures):
-                if results[i] is not None:
-                    continue
-
-                try:
-                    result = future.result(block=False)
-                    results[i] = result
-                except Empty:
-                    all_success = False
-            # if we don't get all of them this pass, wait a short period before checking again
-            if not all_success:
-                time.sleep(0.1)
+        results = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in futures:
+            remaining = (
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+            try:
+                results.append(future.result(timeout=remaining))
+            except Empty:
+                results.append(None)
 
         if unwrap_single_item:
             return results[0]
@@ -258,21 +318,32 @@ class TutkIOCtrlMux:
 
 
 class TutkIOCtrlMuxListener(threading.Thread):
-    __slots__ = "tutk_platform_lib", "av_chan_id", "queues", "exception"
+    __slots__ = (
+        "tutk_platform_lib",
+        "av_chan_id",
+        "pending",
+        "pending_lock",
+        "stop_event",
+        "exception",
+        "recv_buffer",
+    )
 
     def __init__(
         self,
         tutk_platform_lib: CDLL,
-        av_chan_id: c_int,
-        queues: DefaultDict[
-            Union[int, str], Queue[Union[object, tuple[int, int, int, bytes]]]
-        ],
+        av_chan_id: int,
+        pending: DefaultDict[int, deque[TutkIOCtrlFuture]],
+        pending_lock: threading.Lock,
+        stop_event: threading.Event,
     ):
         super().__init__()
         self.tutk_platform_lib = tutk_platform_lib
         self.av_chan_id = av_chan_id
-        self.queues = queues
+        self.pending = pending
+        self.pending_lock = pending_lock
+        self.stop_event = stop_event
         self.exception: Optional[tutk.TutkError] = None
+        self.recv_buffer = create_string_buffer(RECV_BUFFER_LEN)
 
     def join(self, timeout=None):
         super().join(timeout)
@@ -281,16 +352,17 @@ class TutkIOCtrlMuxListener(threading.Thread):
 
     def run(self) -> None:
         timeout_ms = 1000
+        recv_buffer = self.recv_buffer
+        recv_view = memoryview(recv_buffer)
         logger.debug(f"Now listening on channel id {self.av_chan_id}")
 
-        while True:
-            with contextlib.suppress(Empty):
-                control_channel_command = self.queues[CONTROL_CHANNEL].get_nowait()
-                if control_channel_command == STOP_SENTINEL:
-                    logger.debug(f"No longer listening on channel id {self.av_chan_id}")
-                    return
-            actual_len, io_ctl_type, data = tutk.av_recv_io_ctrl(
-                self.tutk_platform_lib, self.av_chan_id, timeout_ms
+        while not self.stop_event.is_set():
+            actual_len, io_ctl_type = tutk.av_recv_io_ctrl_into(
+                self.tutk_platform_lib,
+                self.av_chan_id,
+                recv_buffer,
+                RECV_BUFFER_LEN,
+                timeout_ms,
             )
             if actual_len == tutk.AV_ER_TIMEOUT:
                 continue
@@ -304,9 +376,17 @@ class TutkIOCtrlMuxListener(threading.Thread):
                 self.exception = tutk.TutkError(actual_len)
                 break
 
-            header, payload = tutk_protocol.decode(data)
-            logger.debug(f"RECV {header}: {repr(payload)}")
+            # decode in place; only the payload is copied out of the reused buffer
+            header, payload = tutk_protocol.decode(recv_view[:actual_len])
+            resp_data = None if payload is None else payload.tobytes()
+            logger.debug("RECV %s: %r", header, resp_data)
 
-            self.queues[header.code].put(
-                (actual_len, io_ctl_type, header.protocol, payload)
-            )
+            with self.pending_lock:
+                waiting = self.pending.get(header.code)
+                future = waiting.popleft() if waiting else None
+            if future is None:
+                logger.debug("No request waiting on response code %s", header.code)
+                continue
+            future.set_response(io_ctl_type, header.protocol, resp_data)
+
+        logger.debug(f"No longer listening on channel id {self.av_chan_id}")
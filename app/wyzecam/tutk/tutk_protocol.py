@@ -2,10 +2,11 @@ import json
 import logging
 import time
 from ctypes import LittleEndianStructure, c_char, c_uint16, c_uint32
+from functools import lru_cache
 from os import getenv
 from pathlib import Path
-from struct import iter_unpack, pack, unpack
-from typing import Any, Optional
+from struct import Struct, pack, unpack, unpack_from
+from typing import Any, NamedTuple, Optional
 
 import xxtea
 from wyzecam.api_models import DOORBELL
@@ -14,6 +15,11 @@ from . import tutk
 
 PROJECT_ROOT = Path(getenv("TUTK_PROJECT_ROOT", Path(__file__).parent))
 
+COMMANDS_DB: dict = json.loads((PROJECT_ROOT / "device_config.json").read_bytes())[
+    "supportedCommands"
+]
+"""Commands supported per model and protocol, loaded at import so forked streams inherit it."""
+
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +67,47 @@ class TutkWyzeProtocolHeader(LittleEndianStructure):
         )
 
 
+HEADER = Struct("<2sHHI6x")
+"""
+Packed layout of a [TutkWyzeProtocolHeader][wyzecam.tutk.tutk_protocol.TutkWyzeProtocolHeader]:
+prefix, protocol, code and txt_len, followed by the reserved bytes.
+"""
+
+
+class ProtocolHeader(NamedTuple):
+    """
+    The fields of a [TutkWyzeProtocolHeader][wyzecam.tutk.tutk_protocol.TutkWyzeProtocolHeader],
+    as unpacked by `HEADER`; returned by `decode`.
+    """
+
+    prefix: bytes
+    protocol: int
+    code: int
+    txt_len: int
+
+    def __repr__(self):
+        return (
+            f"<TutkWyzeProtocolHeader "
+            f"prefix={self.prefix} "
+            f"protocol={self.protocol} "
+            f"code={self.code} "
+            f"txt_len={self.txt_len}>"
+        )
+
+
+UINT8 = Struct("<B")
+"""A single byte payload, e.g. an on/off switch value."""
+
+UINT8_PAIR = Struct("<BB")
+"""A two byte payload."""
+
+UINT8_TRIPLE = Struct("<BBB")
+"""A three byte payload, e.g. a PTZ action."""
+
+UINT32 = Struct("<I")
+"""A little-endian uint32 payload, e.g. a unix timestamp."""
+
+
 class TutkWyzeProtocolMessage:
     """
     An abstract class representing a command sent from the client to
@@ -74,6 +121,11 @@ class TutkWyzeProtocolMessage:
     :vartype expected_response_code: int
     """
 
+    __slots__ = ("code", "expected_response_code", "_encoded")
+
+    cache_encoding = True
+    """Reuse the first encoding on resend; disabled for messages that embed the current time."""
+
     def __init__(self, code: int) -> None:
         """Construct a new TutkWyzeProtocolMessage
 
@@ -90,7 +142,16 @@ class TutkWyzeProtocolMessage:
         including the appropriate
         [16 byte header][wyzecam.tutk.tutk_protocol.TutkWyzeProtocolHeader].
         """
-        return encode(self.code, None)
+        return encode_empty(self.code)
+
+    @property
+    def encoded(self) -> bytes:
+        """The result of `encode()`, computed once per message if `cache_encoding` is set."""
+        if not self.cache_encoding:
+            return self.encode()
+        if (encoded := getattr(self, "_encoded", None)) is None:
+            encoded = self._encoded = self.encode()
+        return encoded
 
     def parse_response(self, resp_data: bytes) -> Any:
         """
@@ -114,6 +175,8 @@ class K10000ConnectRequest(TutkWyzeProtocolMessage):
     bytes for the client to sign with the 'enr' of the camera.
     """
 
+    __slots__ = ("mac",)
+
     def __init__(self, mac: Optional[str]):
         """Construct a new K10000ConnectRequest"""
         super().__init__(10000)
@@ -121,18 +184,32 @@ class K10000ConnectRequest(TutkWyzeProtocolMessage):
 
     def encode(self) -> bytes:
         if not self.mac:
-            return encode(self.code, None)
+            return encode_empty(self.code)
 
-        wake_dict = {
-            "cameraInfo": {
-                "mac": self.mac,
-                "encFlag": 0,
-                "wakeupFlag": 1,
-            }
+        return encode(self.code, _wake_json(self.mac))
+
+
+@lru_cache(maxsize=32)
+def _wake_json(mac: str) -> bytes:
+    """The K10000 wake-up payload; fixed per camera, so built once per mac."""
+    wake_dict = {
+        "cameraInfo": {
+            "mac": mac,
+            "encFlag": 0,
+            "wakeupFlag": 1,
         }
-        wake_json = json.dumps(wake_dict, separators=(",", ":")).encode("ascii")
+    }
+    return json.dumps(wake_dict, separators=(",", ":")).encode("ascii")
 
-        return encode(self.code, wake_json)
+
+CONNECT_AUTH = Struct("<16s4sBB")
+"""challenge response, username, video and audio flags of K10002ConnectAuth."""
+
+CONNECT_USER_AUTH = Struct("<16s4sBBB")
+"""
+challenge response, username, video and audio flags, and open_userid length of
+K10006ConnectUserAuth/K10008ConnectUserAuth; the open_userid follows.
+"""
 
 
 class K10002ConnectAuth(TutkWyzeProtocolMessage):
@@ -146,6 +223,8 @@ class K10002ConnectAuth(TutkWyzeProtocolMessage):
     with the result of the authentication exchange (and if successful, a bunch of device information).
     """
 
+    __slots__ = ("challenge_response", "username", "video", "audio")
+
     def __init__(
         self,
         challenge_response: bytes,
@@ -173,17 +252,18 @@ class K10002ConnectAuth(TutkWyzeProtocolMessage):
 
         self.challenge_response = challenge_response
         self.username = mac
-        self.video = video
-        self.audio = audio
+        self.video: int = 1 if video else 0
+        self.audio: int = 1 if audio else 0
 
     def encode(self) -> bytes:
-        data = bytearray([0] * 22)
-        data[0:16] = self.challenge_response
-        data[16:20] = self.username.encode("ascii")[0:4]
-        data[20:21] = bytes([1] if self.video else [0])
-        data[21:22] = bytes([1] if self.audio else [0])
+        data = CONNECT_AUTH.pack(
+            self.challenge_response,
+            self.username.encode("ascii"),
+            self.video,
+            self.audio,
+        )
 
-        return encode(self.code, bytes(data))
+        return encode(self.code, data)
 
     def parse_response(self, resp_data):
         return json.loads(resp_data)
@@ -194,6 +274,8 @@ class K10006ConnectUserAuth(TutkWyzeProtocolMessage):
     New DB protocol version
     """
 
+    __slots__ = ("challenge_response", "username", "open_userid", "video", "audio")
+
     def __init__(
         self,
         challenge_response: bytes,
@@ -218,18 +300,15 @@ class K10006ConnectUserAuth(TutkWyzeProtocolMessage):
         self.audio: int = 1 if audio else 0
 
     def encode(self) -> bytes:
-        open_userid_len = len(self.open_userid)
-        encoded_msg = pack(
-            f"<16s4sbbb{open_userid_len}s",
+        encoded_msg = CONNECT_USER_AUTH.pack(
             self.challenge_response,
             self.username,
             self.video,
             self.audio,
-            open_userid_len,
-            self.open_userid,
+            len(self.open_userid),
         )
 
-        return encode(self.code, encoded_msg)
+        return encode(self.code, encoded_msg + self.open_userid)
 
     def parse_response(self, resp_data):
         return json.loads(resp_data)
@@ -247,6 +326,8 @@ class K10008ConnectUserAuth(TutkWyzeProtocolMessage):
 
     """
 
+    __slots__ = ("challenge_response", "username", "open_userid", "video", "audio")
+
     def __init__(
         self,
         challenge_response: bytes,
@@ -281,18 +362,15 @@ class K10008ConnectUserAuth(TutkWyzeProtocolMessage):
         self.audio: int = 1 if audio else 0
 
     def encode(self) -> bytes:
-        open_userid_len = len(self.open_userid)
-        encoded_msg = pack(
-            f"<16s4sbbb{open_userid_len}s",
+        encoded_msg = CONNECT_USER_AUTH.pack(
             self.challenge_response,
             self.username,
             self.video,
             self.audio,
-            open_userid_len,
-            self.open_userid,
+            len(self.open_userid),
         )
 
-        return encode(self.code, encoded_msg)
+        return encode(self.code, encoded_msg + self.open_userid)
 
     def parse_response(self, resp_data):
         return json.loads(resp_data)
@@ -314,6 +392,8 @@ class K10010ControlChannel(TutkWyzeProtocolMessage):
     - enabled (bool): True if the media should be enabled, False otherwise
     """
 
+    __slots__ = ("media_type", "enabled")
+
     def __init__(self, media_type: int = 1, enabled: bool = False):
         super().__init__(10010)
 
@@ -322,7 +402,7 @@ class K10010ControlChannel(TutkWyzeProtocolMessage):
         self.enabled = 1 if enabled else 2
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.media_type, self.enabled]))
+        return encode(self.code, UINT8_PAIR.pack(self.media_type, self.enabled))
 
 
 class K10020CheckCameraInfo(TutkWyzeProtocolMessage):
@@ -336,17 +416,25 @@ class K10020CheckCameraInfo(TutkWyzeProtocolMessage):
     - A json object with the camera parameters.
     """
 
+    __slots__ = ("count",)
+
     def __init__(self, count: int = 60):
         super().__init__(10020)
         self.count = count
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.count, *range(1, self.count + 1)]))
+        return encode(self.code, _camera_info_payload(self.count))
 
     def parse_response(self, resp_data):
         return json.loads(resp_data)
 
 
+@lru_cache(maxsize=8)
+def _camera_info_payload(count: int) -> bytes:
+    """The K10020 payload: the count, then parameter ids 1..count."""
+    return bytes((count, *range(1, count + 1)))
+
+
 class K10020CheckCameraParams(TutkWyzeProtocolMessage):
     """
     A command used to read multiple parameters from the camera.
@@ -354,6 +442,8 @@ class K10020CheckCameraParams(TutkWyzeProtocolMessage):
     Not terribly well understood.
     """
 
+    __slots__ = ("param_id",)
+
     def __init__(self, *param_id: int):
         super().__init__(10020)
         self.param_id = param_id
@@ -374,6 +464,8 @@ class K10030GetNetworkLightStatus(TutkWyzeProtocolMessage):
         - 2: Off
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10030)
 
@@ -386,6 +478,8 @@ class K10032SetNetworkLightStatus(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(10032)
 
@@ -393,7 +487,7 @@ class K10032SetNetworkLightStatus(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10040GetNightVisionStatus(TutkWyzeProtocolMessage):
@@ -406,6 +500,8 @@ class K10040GetNightVisionStatus(TutkWyzeProtocolMessage):
         - 3: Auto.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10040)
 
@@ -420,12 +516,14 @@ class K10042SetNightVisionStatus(TutkWyzeProtocolMessage):
         - 3: Auto.
     """
 
+    __slots__ = ("status",)
+
     def __init__(self, status: int):
         super().__init__(10042)
         self.status: int = status
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.status]))
+        return encode(self.code, UINT8.pack(self.status))
 
 
 class K10044GetIRLEDStatus(TutkWyzeProtocolMessage):
@@ -437,6 +535,8 @@ class K10044GetIRLEDStatus(TutkWyzeProtocolMessage):
         - 2: Off. 940 nmm close range IR.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10044)
 
@@ -450,15 +550,19 @@ class K10046SetIRLEDStatus(TutkWyzeProtocolMessage):
         - 2: Off. 940 nmm close range IR.
     """
 
+    __slots__ = ("status",)
+
     def __init__(self, status: int):
         super().__init__(10046)
         self.status: int = status
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.status]))
+        return encode(self.code, UINT8.pack(self.status))
 
 
 class K10050GetVideoParam(TutkWyzeProtocolMessage):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10050)
 
@@ -473,6 +577,13 @@ class K10050GetVideoParam(TutkWyzeProtocolMessage):
         }
 
 
+RESOLVING_BIT = Struct("<BH")
+"""K10056 payload: frame size and bitrate."""
+
+VIDEO_PARAM = Struct("<HBBBB")
+"""K10052 payload: bitrate, frame size, fps, horizontal and vertical flip; 0 leaves a field unchanged."""
+
+
 class K10056SetResolvingBit(TutkWyzeProtocolMessage):
     """
     A message used to set the resolution and bitrate of the camera.
@@ -480,6 +591,8 @@ class K10056SetResolvingBit(TutkWyzeProtocolMessage):
     This is sent automatically after the authentication handshake completes successfully.
     """
 
+    __slots__ = ("frame_size", "bitrate")
+
     def __init__(self, frame_size=tutk.FRAME_SIZE_1080P, bitrate=tutk.BITRATE_HD):
         """
         Construct a K10056SetResolvingBit message, with a given frame size and bitrate.
@@ -505,7 +618,7 @@ class K10056SetResolvingBit(TutkWyzeProtocolMessage):
         self.bitrate = bitrate
 
     def encode(self) -> bytes:
-        return encode(self.code, pack("<BH", self.frame_size, self.bitrate))
+        return encode(self.code, RESOLVING_BIT.pack(self.frame_size, self.bitrate))
 
     def parse_response(self, resp_data):
         return resp_data == b"\x01"
@@ -518,6 +631,8 @@ class K10052DBSetResolvingBit(TutkWyzeProtocolMessage):
     This is sent automatically after the authentication handshake completes successfully.
     """
 
+    __slots__ = ("frame_size", "bitrate", "fps")
+
     def __init__(
         self, frame_size=tutk.FRAME_SIZE_1080P, bitrate=tutk.BITRATE_HD, fps: int = 0
     ):
@@ -549,7 +664,7 @@ class K10052DBSetResolvingBit(TutkWyzeProtocolMessage):
         self.fps = fps
 
     def encode(self) -> bytes:
-        payload = pack("<HBBBB", self.bitrate, self.frame_size, self.fps, 0, 0)
+        payload = VIDEO_PARAM.pack(self.bitrate, self.frame_size, self.fps, 0, 0)
 
         return encode(self.code, payload)
 
@@ -558,24 +673,30 @@ class K10052DBSetResolvingBit(TutkWyzeProtocolMessage):
 
 
 class K10052SetFPS(TutkWyzeProtocolMessage):
+    __slots__ = ("fps",)
+
     def __init__(self, fps: int = 0):
         super().__init__(10052)
         self.fps = fps
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([0, 0, 0, self.fps, 0, 0]))
+        return encode(self.code, VIDEO_PARAM.pack(0, 0, self.fps, 0, 0))
 
 
 class K10052SetBitrate(TutkWyzeProtocolMessage):
+    __slots__ = ("bitrate",)
+
     def __init__(self, value: int = 0):
         super().__init__(10052)
         self.bitrate = value
 
     def encode(self) -> bytes:
-        return encode(self.code, pack("<HBBBB", self.bitrate, 0, 0, 0, 0))
+        return encode(self.code, VIDEO_PARAM.pack(self.bitrate, 0, 0, 0, 0))
 
 
 class K10052HorizontalFlip(TutkWyzeProtocolMessage):
+    __slots__ = ("horizontal",)
+
     def __init__(self, value: int = 0):
         super().__init__(10052)
 
@@ -584,10 +705,12 @@ class K10052HorizontalFlip(TutkWyzeProtocolMessage):
         self.horizontal = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([0, 0, 0, 0, self.horizontal, 0]))
+        return encode(self.code, VIDEO_PARAM.pack(0, 0, 0, self.horizontal, 0))
 
 
 class K10052VerticalFlip(TutkWyzeProtocolMessage):
+    __slots__ = ("vertical",)
+
     def __init__(self, value: int = 0):
         super().__init__(10052)
 
@@ -596,7 +719,7 @@ class K10052VerticalFlip(TutkWyzeProtocolMessage):
         self.vertical = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([0, 0, 0, 0, 0, self.vertical]))
+        return encode(self.code, VIDEO_PARAM.pack(0, 0, 0, 0, self.vertical))
 
 
 class K10070GetOSDStatus(TutkWyzeProtocolMessage):
@@ -608,6 +731,8 @@ class K10070GetOSDStatus(TutkWyzeProtocolMessage):
     - 2: Disabled
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10070)
 
@@ -620,6 +745,8 @@ class K10072SetOSDStatus(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         super().__init__(10072)
 
@@ -627,7 +754,7 @@ class K10072SetOSDStatus(TutkWyzeProtocolMessage):
         self.value = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10074GetOSDLogoStatus(TutkWyzeProtocolMessage):
@@ -639,6 +766,8 @@ class K10074GetOSDLogoStatus(TutkWyzeProtocolMessage):
     - 2: Disabled
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10074)
 
@@ -651,6 +780,8 @@ class K10076SetOSDLogoStatus(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         super().__init__(10076)
 
@@ -658,7 +789,7 @@ class K10076SetOSDLogoStatus(TutkWyzeProtocolMessage):
         self.value = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10090GetCameraTime(TutkWyzeProtocolMessage):
@@ -668,6 +799,8 @@ class K10090GetCameraTime(TutkWyzeProtocolMessage):
     :return time: The current unix timestamp in seconds.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10090)
 
@@ -682,11 +815,15 @@ class K10092SetCameraTime(TutkWyzeProtocolMessage):
     This will use the current time on the bridge +1 to set the time on the camera.
     """
 
+    __slots__ = ()
+
+    cache_encoding = False
+
     def __init__(self, _=None):
         super().__init__(10092)
 
     def encode(self) -> bytes:
-        return encode(self.code, pack("<I", int(time.time())))
+        return encode(self.code, UINT32.pack(time.time_ns() // 1_000_000_000))
 
 
 class K10290GetMotionTagging(TutkWyzeProtocolMessage):
@@ -698,11 +835,15 @@ class K10290GetMotionTagging(TutkWyzeProtocolMessage):
         - 2: Disabled
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10290)
 
 
 class K10200GetMotionAlarm(TutkWyzeProtocolMessage):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10200)
 
@@ -712,6 +853,7 @@ class K10200GetMotionAlarm(TutkWyzeProtocolMessage):
 
 
 class K10202SetMotionAlarm(TutkWyzeProtocolMessage):
+    __slots__ = ("value",)
 
     def __init__(self, value: int):
         super().__init__(10202)
@@ -719,10 +861,11 @@ class K10202SetMotionAlarm(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value, 0]))
+        return encode(self.code, UINT8_PAIR.pack(self.value, 0))
 
 
 class K10206SetMotionAlarm(TutkWyzeProtocolMessage):
+    __slots__ = ("value",)
 
     def __init__(self, value: int):
         super().__init__(10206)
@@ -730,7 +873,7 @@ class K10206SetMotionAlarm(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value, 0]))
+        return encode(self.code, UINT8_PAIR.pack(self.value, 0))
 
 
 class K10292SetMotionTagging(TutkWyzeProtocolMessage):
@@ -741,14 +884,16 @@ class K10292SetMotionTagging(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(10292)
 
-        assert 0 <= value <= 2, "value must be 1 or 2"
+        assert 1 <= value <= 2, "value must be 1 or 2"
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10302SetTimeZone(TutkWyzeProtocolMessage):
@@ -759,6 +904,8 @@ class K10302SetTimeZone(TutkWyzeProtocolMessage):
     -  value (int): the time zone to set (-11 to 13).
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(10302)
         assert -11 <= value <= 13, "value must be -11 to 13"
@@ -775,6 +922,8 @@ class K10620CheckNight(TutkWyzeProtocolMessage):
     Not terribly well understood.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10620)
 
@@ -788,6 +937,8 @@ class K10624GetAutoSwitchNightType(TutkWyzeProtocolMessage):
         - 2: Dark. Switch on night vision when the environment has extremely low light.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10624)
 
@@ -801,12 +952,14 @@ class K10626SetAutoSwitchNightType(TutkWyzeProtocolMessage):
         - 2: Dark. Switch on night vision when the environment has extremely low light.
     """
 
+    __slots__ = ("type",)
+
     def __init__(self, type: int):
         super().__init__(10626)
         self.type: int = type
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.type]))
+        return encode(self.code, UINT8.pack(self.type))
 
 
 class K10630SetAlarmFlashing(TutkWyzeProtocolMessage):
@@ -817,13 +970,15 @@ class K10630SetAlarmFlashing(TutkWyzeProtocolMessage):
     -  value (int):  1 to turn on alarm and siren; 2 to turn off alarm and siren.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(10630)
         assert 0 <= value <= 2, "value must be 1 or 2"
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value, self.value]))
+        return encode(self.code, UINT8_PAIR.pack(self.value, self.value))
 
 
 class K10632GetAlarmFlashing(TutkWyzeProtocolMessage):
@@ -835,6 +990,8 @@ class K10632GetAlarmFlashing(TutkWyzeProtocolMessage):
         - (2,2): Off.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10632)
 
@@ -846,6 +1003,8 @@ class K10640GetSpotlightStatus(TutkWyzeProtocolMessage):
     Not terribly well understood.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10640)
 
@@ -855,11 +1014,13 @@ class K10058TakePhoto(TutkWyzeProtocolMessage):
     Take photo on camera sensor and save to /media/mmc/photo/YYYYMMDD/YYYYMMDD_HH_MM_SS.jpg
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10058)
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([1]))
+        return encode(self.code, b"\x01")
 
 
 class K10148StartBoa(TutkWyzeProtocolMessage):
@@ -867,11 +1028,13 @@ class K10148StartBoa(TutkWyzeProtocolMessage):
     Temporarily start boa server
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10148)
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([0, 1, 0, 0, 0]))
+        return encode(self.code, b"\x00\x01\x00\x00\x00")
 
 
 class K10242FormatSDCard(TutkWyzeProtocolMessage):
@@ -882,6 +1045,8 @@ class K10242FormatSDCard(TutkWyzeProtocolMessage):
     -  value (int): 1 to confirm format.
     """
 
+    __slots__ = ()
+
     def __init__(self, value: int = 0):
         super().__init__(10242)
         assert value == 1, "value must be 1 to confirm format!"
@@ -895,13 +1060,15 @@ class K10444SetDeviceState(TutkWyzeProtocolMessage):
     -  value (int): 1 = on; 2 = off. Defaults to on.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int = 1):
         super().__init__(10444)
         assert 0 <= value <= 2, "value must be 1 or 2"
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10446CheckConnStatus(TutkWyzeProtocolMessage):
@@ -912,6 +1079,8 @@ class K10446CheckConnStatus(TutkWyzeProtocolMessage):
     - json: connection status.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10446)
 
@@ -927,6 +1096,8 @@ class K10448GetBatteryUsage(TutkWyzeProtocolMessage):
     - json: battery usage.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10448)
 
@@ -950,13 +1121,15 @@ class K10600SetRtspSwitch(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off. Defaults to True.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int = 1):
         super().__init__(10600)
         assert 1 <= value <= 2, "value must be 1 or 2"
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10604GetRtspParam(TutkWyzeProtocolMessage):
@@ -964,10 +1137,19 @@ class K10604GetRtspParam(TutkWyzeProtocolMessage):
     Get RTSP parameters from supported firmware.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10604)
 
 
+ROTARY_DEGREE = Struct("<hhB")
+"""K11000 payload: horizontal and vertical degrees, speed."""
+
+PTZ_POSITION = Struct("<IBH")
+"""K11006 response and K11018 payload: timestamp in ms, vertical and horizontal angle."""
+
+
 class K11000SetRotaryByDegree(TutkWyzeProtocolMessage):
     """
     Rotate by horizontal and vertical degree?
@@ -981,6 +1163,8 @@ class K11000SetRotaryByDegree(TutkWyzeProtocolMessage):
 
     """
 
+    __slots__ = ("horizontal", "vertical", "speed")
+
     def __init__(self, horizontal: int, vertical: int = 0, speed: int = 5):
         super().__init__(11000)
         self.horizontal = horizontal
@@ -988,7 +1172,7 @@ class K11000SetRotaryByDegree(TutkWyzeProtocolMessage):
         self.speed = speed if 1 < speed < 9 else 5
 
     def encode(self) -> bytes:
-        msg = pack("<hhB", self.horizontal, self.vertical, self.speed)
+        msg = ROTARY_DEGREE.pack(self.horizontal, self.vertical, self.speed)
         return encode(self.code, msg)
 
 
@@ -1011,6 +1195,8 @@ class K11002SetRotaryByAction(TutkWyzeProtocolMessage):
 
     """
 
+    __slots__ = ("horizontal", "vertical", "speed")
+
     def __init__(self, horizontal: int, vertical: int, speed: int = 5):
         super().__init__(11002)
         self.horizontal = horizontal if 0 <= horizontal <= 2 else 0
@@ -1018,7 +1204,9 @@ class K11002SetRotaryByAction(TutkWyzeProtocolMessage):
         self.speed = speed if 1 <= speed <= 9 else 5
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.horizontal, self.vertical, self.speed]))
+        return encode(
+            self.code, UINT8_TRIPLE.pack(self.horizontal, self.vertical, self.speed)
+        )
 
 
 class K11004ResetRotatePosition(TutkWyzeProtocolMessage):
@@ -1029,12 +1217,14 @@ class K11004ResetRotatePosition(TutkWyzeProtocolMessage):
     - position (int,optional): Reset position? Defaults to 3
     """
 
+    __slots__ = ("position",)
+
     def __init__(self, position: int = 3):
         super().__init__(11004)
         self.position = position
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.position]))
+        return encode(self.code, UINT8.pack(self.position))
 
 
 class K11006GetCurCruisePoint(TutkWyzeProtocolMessage):
@@ -1047,17 +1237,25 @@ class K11006GetCurCruisePoint(TutkWyzeProtocolMessage):
         - horizontal (int): horizontal angle.
     """
 
+    __slots__ = ()
+
+    cache_encoding = False
+
     def __init__(self):
         super().__init__(11006)
 
     def encode(self) -> bytes:
-        return encode(self.code, pack("<I", int(time.time())))
+        return encode(self.code, UINT32.pack(time.time_ns() // 1_000_000_000))
 
     def parse_response(self, resp_data: bytes):
-        data = unpack("<IBH", resp_data)
+        data = PTZ_POSITION.unpack(resp_data)
         return {"vertical": data[1], "horizontal": data[2]}
 
 
+CRUISE_POINT = Struct("<BHB")
+"""K11010 response and K11012 payload entry: vertical angle, horizontal angle and wait time."""
+
+
 class K11010GetCruisePoints(TutkWyzeProtocolMessage):
     """
     Get cruise points.
@@ -1069,6 +1267,8 @@ class K11010GetCruisePoints(TutkWyzeProtocolMessage):
         - time (int): wait time in seconds.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(11010)
 
@@ -1079,7 +1279,7 @@ class K11010GetCruisePoints(TutkWyzeProtocolMessage):
                 "horizontal": data[1],
                 "time": data[2],
             }
-            for data in iter_unpack("<BHB", resp_data[1:])
+            for data in CRUISE_POINT.iter_unpack(memoryview(resp_data)[1:])
         ]
 
 
@@ -1095,15 +1295,19 @@ class K11012SetCruisePoints(TutkWyzeProtocolMessage):
     - wait_time(int, optional): Default wait time. Defaults to 10.
     """
 
+    __slots__ = ("points",)
+
     def __init__(self, points: list[dict], wait_time=10):
         super().__init__(11012)
 
-        self.points = bytearray(pack("<B", len(points)))
-        for point in points:
+        self.points = bytearray(1 + len(points) * CRUISE_POINT.size)
+        self.points[0] = len(points)
+        for i, point in enumerate(points):
             vertical = int(point.get("vertical", 0))
             horizontal = int(point.get("horizontal", 0))
             time = int(point.get("time", wait_time))
-            self.points.extend(pack("<BHB", vertical, horizontal, time))
+            offset = 1 + i * CRUISE_POINT.size
+            CRUISE_POINT.pack_into(self.points, offset, vertical, horizontal, time)
 
     def encode(self) -> bytes:
         return encode(self.code, self.points)
@@ -1118,6 +1322,8 @@ class K11014GetCruise(TutkWyzeProtocolMessage):
         - 2: Off
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(11014)
 
@@ -1130,6 +1336,8 @@ class K11016SetCruise(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off. Defaults to On.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(11016)
 
@@ -1137,7 +1345,7 @@ class K11016SetCruise(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K11018SetPTZPosition(TutkWyzeProtocolMessage):
@@ -1149,14 +1357,19 @@ class K11018SetPTZPosition(TutkWyzeProtocolMessage):
     - horizontal (int[0-350], optional): horizontal angle.
     """
 
+    __slots__ = ("vertical", "horizontal")
+
+    cache_encoding = False
+
     def __init__(self, vertical: int = 0, horizontal: int = 0):
         super().__init__(11018)
         self.vertical = vertical
         self.horizontal = horizontal
 
     def encode(self) -> bytes:
-        time_val = int(time.time() * 1000) % 1_000_000_000
-        return encode(self.code, pack("<IBH", time_val, self.vertical, self.horizontal))
+        time_val = time.time_ns() // 1_000_000 % 1_000_000_000
+        payload = PTZ_POSITION.pack(time_val, self.vertical, self.horizontal)
+        return encode(self.code, payload)
 
 
 class K11020GetMotionTracking(TutkWyzeProtocolMessage):
@@ -1169,6 +1382,8 @@ class K11020GetMotionTracking(TutkWyzeProtocolMessage):
         - 2: Disabled
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(11020)
 
@@ -1182,6 +1397,8 @@ class K11022SetMotionTracking(TutkWyzeProtocolMessage):
     -  value (int): 1 for on; 2 for off.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(11022)
 
@@ -1189,7 +1406,7 @@ class K11022SetMotionTracking(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K11635ResponseQuickMessage(TutkWyzeProtocolMessage):
@@ -1203,6 +1420,8 @@ class K11635ResponseQuickMessage(TutkWyzeProtocolMessage):
         - 3: db_response_3 (Leave package at door)
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         super().__init__(11635)
 
@@ -1210,7 +1429,7 @@ class K11635ResponseQuickMessage(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10646SetSpotlightStatus(TutkWyzeProtocolMessage):
@@ -1221,6 +1440,8 @@ class K10646SetSpotlightStatus(TutkWyzeProtocolMessage):
     - value (int): 1 for on; 2 for off.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         super().__init__(10646)
 
@@ -1228,7 +1449,7 @@ class K10646SetSpotlightStatus(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 class K10720GetAccessoriesInfo(TutkWyzeProtocolMessage):
@@ -1236,6 +1457,8 @@ class K10720GetAccessoriesInfo(TutkWyzeProtocolMessage):
     A message used to get the accessories info.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10720)
 
@@ -1248,6 +1471,8 @@ class K10788GetIntegratedFloodlightInfo(TutkWyzeProtocolMessage):
     A message used to get the integrated floodlight info.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10788)
 
@@ -1257,6 +1482,8 @@ class K10820GetWhiteLightInfo(TutkWyzeProtocolMessage):
     A message used to get the white light info.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(10820)
 
@@ -1266,6 +1493,8 @@ class K12060SetFloodLightSwitch(TutkWyzeProtocolMessage):
     A message used to set the flood light switch.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         super().__init__(12060)
 
@@ -1273,7 +1502,7 @@ class K12060SetFloodLightSwitch(TutkWyzeProtocolMessage):
         self.value: int = value
 
     def encode(self) -> bytes:
-        return encode(self.code, bytes([self.value]))
+        return encode(self.code, UINT8.pack(self.value))
 
 
 def encode(code: int, data: Optional[bytes]) -> bytes:
@@ -1283,16 +1512,34 @@ def encode(code: int, data: Optional[bytes]) -> bytes:
     Note: this uses the standard header of `72, 76, 5`
     See CamProtocolUtils for additional headers.
     """
-    data = data or b""
+    if not data:
+        return HEADER.pack(b"HL", 5, code, 0)
 
-    return pack(f"<BBHHH8x{len(data)}s", 72, 76, 5, code, len(data), data)
+    return HEADER.pack(b"HL", 5, code, len(data)) + data
+
+
+@lru_cache(maxsize=None)
+def encode_empty(code: int) -> bytes:
+    """
+    Encode a message without a payload.
+
+    These are the same bytes for every message with the same code (e.g. all of
+    the 'get' commands), so each code is only encoded once.
+    """
+    return encode(code, None)
 
 
 def decode(buf):
+    """Split an IOCtrl message into its header and payload.
+
+    The payload is returned as a memoryview into `buf`, so it is never copied
+    here; callers that keep it beyond the lifetime of `buf`, or hand it to
+    `json.loads`, should convert it with `bytes()` first.
+    """
     if len(buf) < 16:
         raise TutkWyzeProtocolError("IOCtrl message too short")
 
-    header = TutkWyzeProtocolHeader.from_buffer_copy(buf)
+    header = ProtocolHeader._make(HEADER.unpack_from(buf))
 
     if header.prefix != b"HL":
         raise TutkWyzeProtocolError("IOCtrl message should begin with the prefix 'HL'")
@@ -1304,7 +1551,7 @@ def decode(buf):
             f"(header says {expected_size}, got message of len {len(buf)}"
         )
 
-    return header, buf[16:expected_size] if header.txt_len > 0 else None
+    return header, memoryview(buf)[16:expected_size] if header.txt_len > 0 else None
 
 
 STATUS_MESSAGES = {2: "updating", 4: "checking enr", 5: "off"}
@@ -1320,15 +1567,15 @@ def respond_to_ioctrl_10001(
     open_userid: str,
     audio: bool = False,
 ) -> Optional[TutkWyzeProtocolMessage]:
-    camera_status, camera_enr_b = unpack("<B16s", data[:17])
+    camera_status, camera_enr_b = unpack_from("<B16s", data)
 
-    if camera_status in STATUS_MESSAGES:
-        logger.warning(f"Camera is {STATUS_MESSAGES[camera_status]}, can't auth.")
+    if status := STATUS_MESSAGES.get(camera_status):
+        logger.warning("Camera is %s, can't auth.", status)
         return
 
     if camera_status not in {1, 3, 6}:
         logger.warning(
-            f"Unexpected mode for connect challenge response (10001): {camera_status}"
+            "Unexpected mode for connect challenge response (10001): %s", camera_status
         )
         return
 
@@ -1341,19 +1588,20 @@ def respond_to_ioctrl_10001(
     else:
         response = K10002ConnectAuth(resp, mac, audio=audio)
 
-    logger.debug(f"Sending response: {response}")
+    logger.debug("Sending response: %s", response)
     return response
 
 
 def generate_challenge_response(camera_enr_b, enr, camera_status):
     if camera_status == 3:
-        assert len(enr.encode("ascii")) >= 16, "Enr expected to be 16 bytes"
-        camera_secret_key = enr.encode("ascii")[:16]
+        enr_b = enr.encode("ascii")
+        assert len(enr_b) >= 16, "Enr expected to be 16 bytes"
+        camera_secret_key = enr_b[:16]
     elif camera_status == 6:
-        assert len(enr.encode("ascii")) >= 32, "Enr expected to be 32 bytes"
-        secret_key = enr.encode("ascii")[:16]
-        camera_enr_b = xxtea.decrypt(camera_enr_b, secret_key, padding=False)
-        camera_secret_key = enr.encode("ascii")[16:32]
+        enr_b = enr.encode("ascii")
+        assert len(enr_b) >= 32, "Enr expected to be 32 bytes"
+        camera_enr_b = xxtea.decrypt(camera_enr_b, enr_b[:16], padding=False)
+        camera_secret_key = enr_b[16:32]
     else:
         camera_secret_key = b"FFFFFFFFFFFFFFFF"
 
@@ -1361,18 +1609,20 @@ def generate_challenge_response(camera_enr_b, enr, camera_status):
 
 
 def supports(product_model, protocol, command):
-    with open(PROJECT_ROOT / "device_config.json") as f:
-        device_config = json.load(f)
-    commands_db = device_config["supportedCommands"]
+    return str(command) in _supported_commands(product_model, int(protocol))
+
+
+@lru_cache(maxsize=None)
+def _supported_commands(product_model: str, protocol: int) -> frozenset[str]:
     supported_commands = []
 
-    for k in commands_db["default"]:
-        if int(k) <= int(protocol):
-            supported_commands.extend(commands_db["default"][k])
+    for k in COMMANDS_DB["default"]:
+        if int(k) <= protocol:
+            supported_commands.extend(COMMANDS_DB["default"][k])
 
-    if product_model in commands_db:
-        for k in commands_db[product_model]:
-            if int(k) <= int(protocol):
-                supported_commands.extend(commands_db[product_model][k])
+    if product_model in COMMANDS_DB:
+        for k in COMMANDS_DB[product_model]:
+            if int(k) <= protocol:
+                supported_commands.extend(COMMANDS_DB[product_model][k])
 
-    return str(command) in supported_commands
+    return frozenset(supported_commands)